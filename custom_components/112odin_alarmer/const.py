@@ -1,7 +0,0 @@
-DOMAIN = "112odin_alarner"
-DEFAULT_NAME = "112odin"
-DEFAULT_COUNT = 5
-CONF_BEREDSKABSID = "beredskabsID"
-CONF_STATION = "station"
-CONF_COUNT = "count"
-DEFAULT_RSS_URL = "http://www.odin.dk/RSS/RSS.aspx"
@@ -1,16 +1,199 @@
 """112Odin Alarmer integration - HACS-ready v1.5."""
 
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+import time
+
+_IMPORT_STARTED = time.monotonic()
+
+import asyncio
+import logging
+from http import HTTPStatus
+import voluptuous as vol
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN, DEFAULT_RSS_URL, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT,
+    CONF_SCAN_FLOOR, CONF_SCAN_CEILING, DEFAULT_SCAN_FLOOR, DEFAULT_SCAN_CEILING, CONF_FETCH_MODE, FETCH_MODE_LOCAL,
+    DATA_COORDINATORS, DATA_HISTORY, DATA_HISTORY_LIMITS, HISTORY_FILE, CONF_HISTORY_DAYS, CONF_HISTORY_MAX_ROWS,
+    SERVICE_QUERY_HISTORY, DATA_STATS, CONF_ENTRY_TYPE, ENTRY_TYPE_AGGREGATE, CONF_FEED_URLS,
+    DATA_STARTUP, IMPORT_BUDGET, SETUP_BUDGET,
+    CONF_INGEST_MODE, INGEST_MODE_PUSH, CONF_WEBHOOK_ID, CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB,
+    CONF_INCLUDE_CATEGORIES, CONF_EXCLUDE_CATEGORIES,
+)
+from .classifier import CategoryClassifier, parse_categories
+from .coordinator import Subscription, async_get_coordinator, async_release_coordinator, coordinator_key, get_scheduler
+from .history import AlarmHistory, DEFAULT_RETENTION_DAYS, DEFAULT_MAX_ROWS
+from .ingest import parse_push_body
+from .sensor import stats_store
+from .snapshot import async_get_snapshot_store
+
+# Everything the platforms need is imported above, so this is the integration's import cost.
+IMPORT_SECONDS = time.monotonic() - _IMPORT_STARTED
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS = ["sensor", "event"]
+
+QUERY_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional("station"): str,
+    vol.Optional(CONF_BEREDSKABSID): str,
+    vol.Optional("days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+    vol.Optional("limit", default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+})
 
 async def async_setup(hass: HomeAssistant, config: dict):
     hass.data.setdefault(DOMAIN, {})
+
+    async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+        history = await _async_get_history(hass)
+        since = time.time() - call.data["days"] * 86400
+        records = await hass.async_add_executor_job(
+            history.query, call.data.get("station"), call.data.get(CONF_BEREDSKABSID), since, call.data["limit"]
+        )
+        alarms = []
+        for record in records:
+            alarm = record.as_dict()
+            alarm["published"] = dt_util.utc_from_timestamp(record.published).isoformat()
+            alarms.append(alarm)
+        return {"alarms": alarms}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_QUERY_HISTORY, _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA, supports_response=SupportsResponse.ONLY,
+    )
     return True
 
+async def _async_get_history(hass) -> AlarmHistory:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    pending = domain_data.get(DATA_HISTORY)
+    if pending is None:
+        # Entries set up concurrently share the one open of the database.
+        pending = domain_data[DATA_HISTORY] = hass.async_create_task(_async_open_history(hass))
+    return await asyncio.shield(pending)
+
+async def _async_open_history(hass) -> AlarmHistory:
+    history = AlarmHistory(hass.config.path(HISTORY_FILE))
+    await hass.async_add_executor_job(history.open)
+
+    async def _async_close(_event) -> None:
+        await hass.async_add_executor_job(history.close)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close)
+    return history
+
+def _apply_history_limits(hass, history: AlarmHistory, entry_id: str, limits) -> None:
+    # The history is shared, so it keeps as much as the most demanding entry asks for.
+    all_limits = hass.data[DOMAIN].setdefault(DATA_HISTORY_LIMITS, {})
+    if limits is None:
+        all_limits.pop(entry_id, None)
+    else:
+        all_limits[entry_id] = limits
+    if all_limits:
+        history.retention_days = max(days for days, _rows in all_limits.values())
+        history.max_rows = max(rows for _days, rows in all_limits.values())
+
+def _entry_subscription(entry):
+    data = entry.data
+    # The options flow stores its picks in options; the config flow's stay in data.
+    beredskabsID = entry.options.get(CONF_BEREDSKABSID, data.get(CONF_BEREDSKABSID))
+    station = entry.options.get(CONF_STATION, data.get(CONF_STATION, ""))
+    subscription = Subscription(
+        count=max(1, min(20, int(entry.options.get(CONF_COUNT, data.get(CONF_COUNT, DEFAULT_COUNT))))),
+        scan_floor=int(entry.options.get(CONF_SCAN_FLOOR, DEFAULT_SCAN_FLOOR)),
+        scan_ceiling=int(entry.options.get(CONF_SCAN_CEILING, DEFAULT_SCAN_CEILING)),
+        local_filter=entry.options.get(CONF_FETCH_MODE) == FETCH_MODE_LOCAL,
+        feed_urls=tuple(data.get(CONF_FEED_URLS, ())) if data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_AGGREGATE else (),
+        push=entry.options.get(CONF_INGEST_MODE) == INGEST_MODE_PUSH and bool(entry.options.get(CONF_WEBHOOK_ID)),
+        max_body_kb=int(entry.options.get(CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB)),
+        # Built once per options change; the entry reloads when they change.
+        classifier=CategoryClassifier(parse_categories(entry.options.get(CONF_INCLUDE_CATEGORIES)),
+                                      parse_categories(entry.options.get(CONF_EXCLUDE_CATEGORIES))),
+    )
+    return data.get("rss_url") or DEFAULT_RSS_URL, beredskabsID, station, subscription
+
 async def async_setup_entry(hass, entry):
-    # Forward setup to sensor platform
-    await hass.config_entries.async_forward_entry_setup(entry, "sensor")
+    started = time.monotonic()
+    rss_url, beredskabsID, station, subscription = _entry_subscription(entry)
+    coordinator, needs_refresh = async_get_coordinator(hass, entry.entry_id, rss_url, beredskabsID, station, subscription)
+    snapshots = await async_get_snapshot_store(hass)
+    coordinator.snapshots = snapshots
+    history = await _async_get_history(hass)
+    _apply_history_limits(hass, history, entry.entry_id, (
+        int(entry.options.get(CONF_HISTORY_DAYS, DEFAULT_RETENTION_DAYS)),
+        int(entry.options.get(CONF_HISTORY_MAX_ROWS, DEFAULT_MAX_ROWS)),
+    ))
+    coordinator.history = history
+    if coordinator.data is None:
+        restored = snapshots.get(coordinator.key)
+        if restored is not None:
+            coordinator.restore(restored)
+    if needs_refresh:
+        # Never block setup (and so HA startup) on the network: restored items,
+        # or an empty sensor, are served until the refresh lands. Entries with
+        # restored items can wait their turn, so their first polls are staggered.
+        delay = get_scheduler(hass).start_offset() if coordinator.data is not None else 0
+        entry.async_create_background_task(hass, _async_first_refresh(coordinator, delay),
+                                           f"{DOMAIN} refresh {coordinator.key}")
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    if subscription.push:
+        _register_webhook(hass, entry, coordinator)
+    # Forward setup to the sensor and event platforms
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _record_startup(hass, entry, time.monotonic() - started)
     return True
 
+async def _async_first_refresh(coordinator, delay: float) -> None:
+    if delay:
+        await asyncio.sleep(delay)
+    await coordinator.async_refresh()
+
+def _record_startup(hass, entry, setup_seconds: float) -> None:
+    hass.data[DOMAIN].setdefault(DATA_STARTUP, {})[entry.entry_id] = {
+        "import_seconds": round(IMPORT_SECONDS, 4),
+        "setup_seconds": round(setup_seconds, 4),
+        "import_budget": IMPORT_BUDGET,
+        "setup_budget": SETUP_BUDGET,
+    }
+    if IMPORT_SECONDS > IMPORT_BUDGET or setup_seconds > SETUP_BUDGET:
+        _LOGGER.warning("%s: import took %.3fs (budget %.2fs), setup %.3fs (budget %.2fs)",
+                        entry.title, IMPORT_SECONDS, IMPORT_BUDGET, setup_seconds, SETUP_BUDGET)
+    else:
+        _LOGGER.debug("%s: import took %.3fs, setup %.3fs", entry.title, IMPORT_SECONDS, setup_seconds)
+
+def _register_webhook(hass, entry, coordinator) -> None:
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+
+    async def _async_handle_push(hass, webhook_id, request) -> web.Response:
+        try:
+            items = parse_push_body(await request.read(), request.content_type)
+        except ValueError as err:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=str(err))
+        # Same path as a poll: the sensor dedupes, updates and fires new-alarm events.
+        return web.json_response({"received": len(items), "new": coordinator.async_ingest(items)})
+
+    webhook.async_register(hass, DOMAIN, entry.title, webhook_id, _async_handle_push)
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+    # The webhook id is the endpoint's only secret; the URL is shown once, by the options flow.
+    _LOGGER.debug("%s accepts pushed alarms on its webhook", entry.title)
+
+async def _async_options_updated(hass, entry):
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass, entry):
-    return await hass.config_entries.async_forward_entry_unload(entry, "sensor")
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].get(DATA_STARTUP, {}).pop(entry.entry_id, None)
+        await async_release_coordinator(hass, entry.entry_id, coordinator)
+        _apply_history_limits(hass, await _async_get_history(hass), entry.entry_id, None)
+    return unload_ok
+
+async def async_remove_entry(hass, entry):
+    hass.data.get(DOMAIN, {}).get(DATA_STATS, {}).pop(entry.entry_id, None)
+    await stats_store(hass, entry.entry_id).async_remove()
+    key = coordinator_key(*_entry_subscription(entry))
+    if key not in hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {}):
+        (await async_get_snapshot_store(hass)).async_remove(key)
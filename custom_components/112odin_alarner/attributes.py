@@ -0,0 +1,20 @@
+"""State attributes of the feed sensor, built from plain item dicts."""
+from __future__ import annotations
+from typing import Any, Dict, List
+
+
+def slim_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    # "summary" always mirrors "description"; drop it from the attributes.
+    return {key: value for key, value in item.items() if key != "summary"}
+
+
+def build_attributes(entries: List[Dict[str, Any]], rss_url: str, last_update: str) -> Dict[str, Any]:
+    latest = entries[0] if entries else {}
+    return {
+        "entries": [slim_item(item) for item in entries],
+        "latest_title": latest.get("title"),
+        "latest_published": latest.get("published"),
+        "latest_link": latest.get("link"),
+        "last_update": last_update,
+        "rss_url": rss_url
+    }
@@ -0,0 +1,70 @@
+"""Circuit breaker shared by everything that polls the same ODIN endpoint."""
+from __future__ import annotations
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 3
+COOLDOWN = 60
+MAX_COOLDOWN = 900
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures; open -> half-open after a cooldown.
+
+    In half-open state a single probe is let through: success closes the
+    breaker, failure reopens it with a doubled cooldown (capped at
+    `max_cooldown`).
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN,
+                 max_cooldown: float = MAX_COOLDOWN) -> None:
+        self._threshold = threshold
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+
+    def allow(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self._opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self._probe_at = now
+            return True
+        if self.state == HALF_OPEN and now - self._probe_at >= self.cooldown:
+            # The previous probe never reported back (e.g. it was cancelled).
+            self._probe_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self._base_cooldown
+
+    def record_failure(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self._max_cooldown, self.cooldown * 2)
+        if self.state == HALF_OPEN or self.failures >= self._threshold:
+            self.state = OPEN
+            self._opened_at = now
+
+    def retry_in(self, now: float | None = None) -> float:
+        """Seconds until the next attempt is worth making."""
+        now = time.monotonic() if now is None else now
+        if self.state == CLOSED:
+            return float(2 ** self.failures)
+        return max(1.0, self._opened_at + self.cooldown - now)
@@ -0,0 +1,44 @@
+"""Short-lived cache of parsed feeds with one in-flight request per URL."""
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Items = List[Dict[str, Any]]
+
+
+class FeedCache:
+    """Keep parsed items per URL for `ttl` seconds.
+
+    Concurrent `async_get` calls for a URL that is not cached share one fetch,
+    so a wizard step and a sensor refresh never hit ODIN twice for the same data.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._items: Dict[str, Tuple[float, Items]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def get(self, url: str) -> Optional[Items]:
+        cached = self._items.get(url)
+        if cached is None or time.monotonic() - cached[0] > self._ttl:
+            return None
+        return cached[1]
+
+    def put(self, url: str, items: Items) -> None:
+        self._items[url] = (time.monotonic(), items)
+
+    async def async_get(self, url: str, fetch: Callable[[], Awaitable[Items]]) -> Items:
+        cached = self.get(url)
+        if cached is not None:
+            return cached
+        pending = self._inflight.get(url)
+        if pending is None:
+            pending = self._inflight[url] = asyncio.ensure_future(fetch())
+            pending.add_done_callback(lambda fut: self._done(url, fut))
+        return await asyncio.shield(pending)
+
+    def _done(self, url: str, fut: asyncio.Future) -> None:
+        self._inflight.pop(url, None)
+        if not fut.cancelled() and fut.exception() is None:
+            self.put(url, fut.result())
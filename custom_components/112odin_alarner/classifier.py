@@ -0,0 +1,96 @@
+"""Include/exclude keyword categories matched in one Aho-Corasick pass per item."""
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def parse_categories(text: str | None) -> List[str]:
+    """Comma or newline separated categories, stripped and without repeats."""
+    categories: Dict[str, None] = {}
+    for category in (text or "").replace("\n", ",").split(","):
+        category = category.strip()
+        if category:
+            categories[category] = None
+    return list(categories)
+
+
+class KeywordAutomaton:
+    """Case-insensitive multi-pattern matcher; `search` is linear in the text length."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern.casefold():
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = child
+            self._out[node] += (index,)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def search(self, text: str) -> Iterator[int]:
+        """Yield the index of every pattern occurrence, ordered by where it ends."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text.casefold():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            yield from out[node]
+
+
+class CategoryClassifier:
+    """Drop items matching an exclude category or, when includes are set, matching none of them.
+
+    Kept items are tagged with the first include category found in the title,
+    then the description. Both lists share one automaton, so each item is
+    scanned once.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()) -> None:
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self._automaton = KeywordAutomaton(self.include + self.exclude)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def classify(self, item: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Return (keep, category) for an item."""
+        text = f"{item.get('title') or ''}\n{item.get('description') or ''}"
+        category = None
+        for index in self._automaton.search(text):
+            if index >= len(self.include):
+                return False, None
+            if category is None:
+                category = self.include[index]
+        return category is not None or not self.include, category
+
+    def accepts(self, item: Dict[str, Any]) -> bool:
+        return self.classify(item)[0]
+
+    def apply(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Kept items as copies carrying a `category` key."""
+        kept = []
+        for item in items:
+            keep, category = self.classify(item)
+            if keep:
+                kept.append({**item, "category": category})
+        return kept
@@ -0,0 +1,185 @@
+"""Poll or profile an ODIN feed with the integration's client, without Home Assistant.
+
+    python scripts/odin_feed.py poll "http://www.odin.dk/RSS/RSS.aspx?beredskabsID=1234" --count 20 --interval 30
+    python scripts/odin_feed.py profile tests/fixtures/odin_rss.xml --repeat 500
+    python scripts/odin_feed.py profile http://127.0.0.1:8080/RSS/RSS.aspx --repeat 200 --concurrency 8
+
+`poll` prints one JSON line per request. `profile` prints a JSON report with
+throughput and latency percentiles; pointed at a file it times parsing only.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import pathlib
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from xml.etree.ElementTree import ParseError
+import aiohttp
+from .client import async_request, trace_config
+from .const import DEFAULT_COUNT
+from .index import FeedIndex, normalize_items
+from .metrics import FeedMetrics, FetchTiming, RollingHistogram
+from .parser import MAX_BODY_BYTES, BodyTooLargeError, parse_bytes
+from .parsepool import PARSE_WORKERS, ParsePool, ParseQueueFullError
+from .seen import SeenItems
+
+PROFILE_REPEAT = 100
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+
+def _session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(trace_configs=[trace_config()])
+
+
+async def async_poll(url: str, count: int, interval: float, polls: int, max_bytes: int = MAX_BODY_BYTES,
+                     out=sys.stdout) -> FeedMetrics:
+    """Conditional GETs every `interval` seconds, like the coordinator; 0 `polls` runs until interrupted."""
+    metrics = FeedMetrics()
+    pool = ParsePool()
+    seen = SeenItems()
+    headers: Dict[str, str] = {}
+    n = 0
+    async with _session() as session:
+        while not polls or n < polls:
+            if n:
+                await asyncio.sleep(interval)
+            n += 1
+            timing = FetchTiming(time.monotonic())
+            metrics.fetch_started()
+            line: Dict[str, Any] = {"poll": n}
+            try:
+                response = await async_request(session, url, count, timing, max_bytes, headers, pool)
+            except (aiohttp.ClientError, asyncio.TimeoutError, BodyTooLargeError, ParseQueueFullError) as err:
+                metrics.fetch_finished(timing, False)
+                line["error"] = str(err) or type(err).__name__
+            else:
+                metrics.fetch_finished(timing, True)
+                if response.items is None:
+                    metrics.count("not_modified")
+                    line["status"] = 304
+                else:
+                    headers = {name: value for name, value in (("If-None-Match", response.etag),
+                               ("If-Modified-Since", response.last_modified)) if value}
+                    line.update(status=200, items=len(response.items), new=len(seen.update(response.items)),
+                                bytes=timing.bytes)
+            line["ms"] = {name: _ms(getattr(timing, name)) for name in ("dns", "connect", "ttfb", "body", "parse", "total")}
+            print(json.dumps(line), file=out, flush=True)
+    pool.shutdown()
+    return metrics
+
+
+def profile_bytes(raw: bytes, count: Optional[int], repeat: int) -> Dict[str, Any]:
+    """Time parse, normalize and index of `raw`, the CPU side of every poll."""
+    parse = RollingHistogram(repeat)
+    total = RollingHistogram(repeat)
+    items: List[Dict[str, Any]] = []
+    wall = time.perf_counter()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = [item.as_dict() for item in parse_bytes(raw, count)]
+        parsed = time.perf_counter()
+        FeedIndex(normalize_items(items))
+        parse.add(parsed - started)
+        total.add(time.perf_counter() - started)
+    wall = time.perf_counter() - wall
+    return {
+        "runs": repeat,
+        "items": len(items),
+        "bytes": len(raw),
+        "runs_per_s": round(repeat / wall, 1),
+        "items_per_s": round(repeat * len(items) / wall, 1),
+        "mb_per_s": round(repeat * len(raw) / wall / 1e6, 2),
+        "parse_ms": {pct: _ms(parse.percentile(pct)) for pct in (50, 95, 99)},
+        "total_ms": {pct: _ms(total.percentile(pct)) for pct in (50, 95, 99)},
+    }
+
+
+async def async_profile_url(url: str, count: Optional[int], repeat: int, concurrency: int,
+                            max_bytes: int = MAX_BODY_BYTES, pool: Optional[ParsePool] = None) -> Dict[str, Any]:
+    """`repeat` unconditional fetches spread over `concurrency` workers."""
+    pool = pool or ParsePool()
+    metrics = FeedMetrics(repeat)
+    remaining = iter(range(repeat))
+    items = 0
+
+    async def _worker(session) -> None:
+        nonlocal items
+        for _ in remaining:
+            timing = FetchTiming(time.monotonic())
+            metrics.fetch_started()
+            try:
+                response = await async_request(session, url, count, timing, max_bytes, pool=pool)
+            except (aiohttp.ClientError, asyncio.TimeoutError, BodyTooLargeError, ParseQueueFullError):
+                metrics.fetch_finished(timing, False)
+            else:
+                metrics.fetch_finished(timing, True)
+                items += len(response.items)
+
+    async with _session() as session:
+        wall = time.perf_counter()
+        await asyncio.gather(*(_worker(session) for _ in range(concurrency)))
+        wall = time.perf_counter() - wall
+    pool.shutdown()
+    ok = metrics.counters["fetches"] - metrics.counters["failures"]
+    return {
+        "fetches": metrics.counters["fetches"],
+        "failures": metrics.counters["failures"],
+        "concurrency": concurrency,
+        "fetches_per_s": round(ok / wall, 1),
+        "items_per_s": round(items / wall, 1),
+        "ms": {name: {pct: _ms(metrics.timings[name].percentile(pct)) for pct in (50, 95, 99)}
+               for name in ("ttfb", "body", "parse", "executor_wait", "total")},
+        "metrics": metrics.as_dict(),
+        "parse_pool": pool.as_dict(),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="odin_feed", description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="log parse warnings and fallbacks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    poll = commands.add_parser("poll", help="poll a feed and print one JSON line per request")
+    poll.add_argument("url")
+    poll.add_argument("--count", type=int, default=DEFAULT_COUNT)
+    poll.add_argument("--interval", type=float, default=30.0, help="seconds between polls")
+    poll.add_argument("--polls", type=int, default=0, help="stop after this many (default: run until interrupted)")
+    poll.add_argument("--max-kb", type=int, default=MAX_BODY_BYTES // 1024)
+    profile = commands.add_parser("profile", help="measure parse or fetch throughput")
+    profile.add_argument("source", help="a feed URL, or a saved feed file to time parsing only")
+    profile.add_argument("--count", type=int, default=None, help="items to parse (default: all)")
+    profile.add_argument("--repeat", type=int, default=PROFILE_REPEAT)
+    profile.add_argument("--concurrency", type=int, default=1, help="parallel fetches (URLs only)")
+    profile.add_argument("--max-kb", type=int, default=MAX_BODY_BYTES // 1024)
+    profile.add_argument("--parse-workers", type=int, default=PARSE_WORKERS, help="feedparser fallback workers")
+    profile.add_argument("--processes", action="store_true", help="run feedparser fallbacks in processes")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    max_bytes = args.max_kb * 1024
+    try:
+        if args.command == "poll":
+            metrics = asyncio.run(async_poll(args.url, args.count, args.interval, args.polls, max_bytes))
+            print(json.dumps(metrics.as_dict()))
+        elif "://" in args.source:
+            pool = ParsePool(args.parse_workers, processes=args.processes)
+            print(json.dumps(asyncio.run(async_profile_url(args.source, args.count, args.repeat,
+                                                           args.concurrency, max_bytes, pool)), indent=2))
+        else:
+            raw = pathlib.Path(args.source).read_bytes()
+            print(json.dumps(profile_bytes(raw, args.count, args.repeat), indent=2))
+    except ParseError as err:
+        # The integration would fall back to feedparser; profiling that is not useful.
+        print(f"{args.source}: malformed feed ({err})", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
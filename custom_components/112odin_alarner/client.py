@@ -0,0 +1,234 @@
+"""Home Assistant-independent ODIN client: one GET, stream-parsed to items.
+
+`async_guarded_request` adds the breaker, request scheduler, host limit and
+metrics every integration fetch goes through; the integration supplies its
+shared instances, the load harness its own. The CLI in `cli.py` uses the bare
+request on a plain aiohttp session.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+from xml.etree.ElementTree import ParseError
+import aiohttp
+from .breaker import CircuitBreaker, CircuitOpenError
+from .metrics import FeedMetrics, FetchTiming
+from .parser import CHUNK_SIZE, BodyTooLargeError, MAX_BODY_BYTES, async_parse_stream
+from .parsepool import ParsePool, ParseQueueFullError
+from .ratelimit import RequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMEOUT = 10
+# aiohttp decompresses transparently; asking explicitly keeps brotli (an optional
+# extra) out of the negotiation so every install behaves the same.
+ACCEPT_ENCODING = "gzip, deflate"
+
+# Raised by our own back-pressure and size cap, not by the server: they never
+# count against the endpoint's breaker, which is shared by every entry on it.
+LOCAL_ERRORS = (ParseQueueFullError, BodyTooLargeError)
+
+
+class FeedResponse(NamedTuple):
+    # None when the server answered 304 Not Modified.
+    items: Optional[List[Dict[str, Any]]]
+    # Bytes read before the parser stopped; hashing them detects unchanged feeds.
+    consumed: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def parse_fallback_items(raw: bytes, count: int | None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Blocking feedparser parse to plain items, plus the parse warning if any.
+
+    Module level and returning plain data so a process pool can run it.
+    """
+    # feedparser is only needed for malformed feeds, so its sizeable import
+    # happens here, off the event loop, the first time one shows up.
+    import feedparser
+    feed = feedparser.parse(raw)
+    items = []
+    for it in (feed.entries or [])[:count]:
+        items.append({
+            "title": it.get("title"),
+            "description": it.get("description") or it.get('summary'),
+            "summary": it.get('summary'),
+            "published": it.get("published", it.get("updated", "")),
+            "link": it.get("link"),
+            "guid": it.get("id")
+        })
+    warning = str(getattr(feed, 'bozo_exception', 'unknown')) if getattr(feed, 'bozo', False) else None
+    return items, warning
+
+
+async def async_parse_fallback(raw: bytes, count: int | None, timing: FetchTiming | None = None,
+                               pool: ParsePool | None = None, key: Hashable = None) -> List[Dict[str, Any]]:
+    """Parse with feedparser on `pool`, keyed by `key` so a newer body for it supersedes a waiting one.
+
+    Without a pool the loop's default executor is used.
+    """
+    if pool is not None:
+        (items, warning), waited, took = await pool.run(key, parse_fallback_items, raw, count)
+    else:
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+
+        def _parse():
+            started = time.monotonic()
+            return parse_fallback_items(raw, count), started - submitted, time.monotonic() - started
+
+        (items, warning), waited, took = await loop.run_in_executor(None, _parse)
+    if timing is not None:
+        timing.executor_wait = waited
+        timing.parse = took
+    if warning is not None:
+        _LOGGER.warning("Feed parsed with warnings: %s", warning)
+    return items
+
+
+async def _timed_chunks(resp, timing: FetchTiming):
+    # Time spent waiting on the socket is body time; the rest of the read is parsing.
+    chunks = resp.content.iter_chunked(CHUNK_SIZE)
+    while True:
+        started = time.monotonic()
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            timing.body += time.monotonic() - started
+            return
+        timing.body += time.monotonic() - started
+        yield chunk
+
+
+async def _read_rest(resp, consumed: bytes, max_bytes: int) -> bytes:
+    body = bytearray(consumed)
+    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+        body += chunk
+        if len(body) > max_bytes:
+            raise BodyTooLargeError(f"Response exceeded {max_bytes} bytes")
+    return bytes(body)
+
+
+async def async_read_items(resp, count: int | None, timing: FetchTiming | None = None,
+                           max_bytes: int = MAX_BODY_BYTES,
+                           pool: ParsePool | None = None) -> Tuple[List[Dict[str, Any]], bytes]:
+    """Stream-parse a 200 response, falling back to feedparser (on `pool`) for malformed XML.
+
+    Never holds more than `max_bytes` of (decompressed) body; a declared length
+    over the cap aborts before anything is read.
+    """
+    if resp.content_length is not None and resp.content_length > max_bytes:
+        raise BodyTooLargeError(f"Response of {resp.content_length} bytes exceeds {max_bytes}")
+    timing = timing or FetchTiming(time.monotonic())
+    started = time.monotonic()
+    timing.body = 0.0
+    try:
+        parsed, consumed = await async_parse_stream(_timed_chunks(resp, timing), count, max_bytes=max_bytes)
+    except ParseError as err:
+        _LOGGER.debug("Streaming parse failed (%s), falling back to feedparser", err)
+        rest_started = time.monotonic()
+        consumed = await _read_rest(resp, err.consumed, max_bytes)
+        timing.body += time.monotonic() - rest_started
+        items = await async_parse_fallback(consumed, count, timing, pool, (str(resp.url), count))
+    else:
+        timing.parse = time.monotonic() - started - timing.body
+        items = [item.as_dict() for item in parsed]
+    timing.bytes = len(consumed)
+    timing.items = len(items)
+    return items, consumed
+
+
+async def async_request(session: aiohttp.ClientSession, url: str, count: int | None,
+                        timing: FetchTiming | None = None, max_bytes: int = MAX_BODY_BYTES,
+                        headers: Dict[str, str] | None = None, pool: ParsePool | None = None) -> FeedResponse:
+    """GET `url` once and parse it; raises `aiohttp.ClientResponseError` on other than 200/304.
+
+    `timing` is filled in as the request runs, `total` included even when it fails.
+    """
+    timing = timing or FetchTiming(time.monotonic())
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                               headers={"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})},
+                               trace_request_ctx=timing) as resp:
+            if resp.status == 304:
+                return FeedResponse(None, b"", resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            if resp.status != 200:
+                raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status,
+                                                  message=f"HTTP {resp.status}", headers=resp.headers)
+            items, consumed = await async_read_items(resp, count, timing, max_bytes, pool)
+            return FeedResponse(items, consumed, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    finally:
+        timing.total = time.monotonic() - timing.start
+
+
+async def async_guarded_request(session: aiohttp.ClientSession, url: str, count: int | None,
+                                breaker: CircuitBreaker, scheduler: RequestScheduler, host_limit: asyncio.Semaphore,
+                                metrics: FeedMetrics | None = None, max_bytes: int = MAX_BODY_BYTES,
+                                headers: Dict[str, str] | None = None, pool: ParsePool | None = None,
+                                priority: float = 0.0) -> FeedResponse:
+    """`async_request` behind `breaker`, a `scheduler` slot for the host and `host_limit`.
+
+    Lower `priority` is served first; a 304 to a request that sent no validators
+    raises `aiohttp.ClientError`.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(url)
+    await scheduler.acquire(urlsplit(url).netloc.lower(), priority)
+    ok = False
+    async with host_limit:
+        timing = FetchTiming(time.monotonic())
+        if metrics is not None:
+            metrics.fetch_started()
+        try:
+            response = await async_request(session, url, count, timing, max_bytes, headers, pool)
+            if response.items is None and not headers:
+                raise aiohttp.ClientError(f"Unexpected 304 for unconditional request of {url}")
+            ok = True
+        except LOCAL_ERRORS:
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            if metrics is not None:
+                metrics.fetch_finished(timing, ok)
+    breaker.record_success()
+    return response
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """Fill the `FetchTiming` passed as `trace_request_ctx` with connection-level timings."""
+
+    def _timing(ctx) -> FetchTiming | None:
+        timing = ctx.trace_request_ctx
+        return timing if isinstance(timing, FetchTiming) else None
+
+    async def _dns_start(_session, ctx, _params):
+        if (timing := _timing(ctx)) is not None:
+            timing.dns_start = time.monotonic()
+
+    async def _dns_end(_session, ctx, _params):
+        if (timing := _timing(ctx)) is not None and timing.dns_start is not None:
+            timing.dns = time.monotonic() - timing.dns_start
+
+    async def _connect_start(_session, ctx, _params):
+        if (timing := _timing(ctx)) is not None:
+            timing.connect_start = time.monotonic()
+
+    async def _connect_end(_session, ctx, _params):
+        if (timing := _timing(ctx)) is not None and timing.connect_start is not None:
+            timing.connect = time.monotonic() - timing.connect_start
+
+    async def _headers_received(_session, ctx, _params):
+        if (timing := _timing(ctx)) is not None:
+            timing.ttfb = time.monotonic() - timing.start
+
+    trace = aiohttp.TraceConfig()
+    trace.on_dns_resolvehost_start.append(_dns_start)
+    trace.on_dns_resolvehost_end.append(_dns_end)
+    trace.on_connection_create_start.append(_connect_start)
+    trace.on_connection_create_end.append(_connect_end)
+    trace.on_request_end.append(_headers_received)
+    return trace
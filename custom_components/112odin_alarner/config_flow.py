@@ -1,11 +1,15 @@
 """Config flow with dynamic live-fetched dropdowns from ODIN RSS."""
 from __future__ import annotations
-import asyncio
-import feedparser
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN, DEFAULT_RSS_URL, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT
+from homeassistant.core import callback
+from .const import (
+    DOMAIN, DEFAULT_RSS_URL, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT,
+    CONF_ENTRY_TYPE, ENTRY_TYPE_AGGREGATE, CONF_FEED_URLS,
+)
+from .coordinator import async_get_feed
+from .extract import StationMap, beredskabs_ids, build_station_map, stations_for
+from .options_flow import OdinOptionsFlowHandler
 from typing import Any, Dict, List
 
 class OdinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -16,54 +20,41 @@ class OdinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         self._beredskabs_list: List[str] = []
+        self._station_map: StationMap | None = None
         self._selected_id: str | None = None
 
-    async def _fetch_feed(self) -> Any:
-        session = async_get_clientsession(self.hass)
-        timeout = 10
-        async with session.get(DEFAULT_RSS_URL, timeout=timeout) as resp:
-            resp.raise_for_status()
-            raw = await resp.read()
-        loop = asyncio.get_running_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, raw)
-        return feed
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return OdinOptionsFlowHandler(config_entry)
+
+    async def _fetch_feed(self) -> List[Dict[str, Any]]:
+        # Served from the shared TTL cache, so the second step does not refetch.
+        return await async_get_feed(self.hass, DEFAULT_RSS_URL)
+
+    async def _load_station_map(self) -> StationMap:
+        if self._station_map is None:
+            self._station_map = build_station_map(await self._fetch_feed())
+        return self._station_map
 
     async def async_step_user(self, user_input: Dict[str, Any] | None = None):
+        return self.async_show_menu(step_id="user", menu_options=["single", "aggregate"])
+
+    async def async_step_single(self, user_input: Dict[str, Any] | None = None):
         errors = {}
         if not self._beredskabs_list:
             try:
-                feed = await self._fetch_feed()
+                mapping = await self._load_station_map()
             except Exception:
                 errors["base"] = "fetch_error"
-                return self.async_show_form(step_id="user", data_schema=vol.Schema({}), errors=errors)
-
-            ids: List[str] = []
-            for entry in (feed.entries or []):
-                link = entry.get('link', '') or ''
-                summary = entry.get('summary', '') or ''
-                if 'beredskabsID=' in link:
-                    try:
-                        val = link.split('beredskabsID=')[1].split('&')[0]
-                        if val and val not in ids:
-                            ids.append(val)
-                    except Exception:
-                        pass
-                if 'beredskabsID=' in summary:
-                    try:
-                        val = summary.split('beredskabsID=')[1].split('&')[0]
-                        if val and val not in ids:
-                            ids.append(val)
-                    except Exception:
-                        pass
-            if not ids:
-                ids = [""]
-            self._beredskabs_list = ids
+                return self.async_show_form(step_id="single", data_schema=vol.Schema({}), errors=errors)
+            self._beredskabs_list = beredskabs_ids(mapping) or [""]
 
         if user_input is None:
             schema = vol.Schema({
                 vol.Required(CONF_BEREDSKABSID, default=self._beredskabs_list[0]): vol.In(self._beredskabs_list)
             })
-            return self.async_show_form(step_id="user", data_schema=schema)
+            return self.async_show_form(step_id="single", data_schema=schema)
 
         self._selected_id = user_input.get(CONF_BEREDSKABSID)
         return await self.async_step_station()
@@ -71,29 +62,12 @@ class OdinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_station(self, user_input: Dict[str, Any] | None = None):
         errors = {}
         try:
-            feed = await self._fetch_feed()
+            mapping = await self._load_station_map()
         except Exception:
             errors["base"] = "fetch_error"
             return self.async_show_form(step_id="station", data_schema=vol.Schema({}), errors=errors)
 
-        stations: List[str] = []
-        for entry in (feed.entries or []):
-            link = entry.get('link', '') or ''
-            summary = entry.get('summary', '') or ''
-            title = entry.get('title', '') or ''
-            if self._selected_id and self._selected_id not in link and self._selected_id not in summary:
-                continue
-            station = None
-            if 'enhed=' in link:
-                try:
-                    station = link.split('enhed=')[1].split('&')[0]
-                except Exception:
-                    station = None
-            if not station and '-' in title:
-                station = title.split('-')[0].strip()
-            if station and station not in stations:
-                stations.append(station)
-
+        stations = stations_for(mapping, self._selected_id)
         if not stations:
             stations = [""]
 
@@ -112,3 +86,33 @@ class OdinConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         }
         title = f"112odin {self._selected_id}"
         return self.async_create_entry(title=title, data=data)
+
+    async def async_step_aggregate(self, user_input: Dict[str, Any] | None = None):
+        errors = {}
+        if user_input is not None:
+            feed_urls = parse_feed_urls(user_input.get(CONF_FEED_URLS, ""))
+            if feed_urls:
+                data = {
+                    CONF_ENTRY_TYPE: ENTRY_TYPE_AGGREGATE,
+                    CONF_FEED_URLS: feed_urls,
+                    CONF_COUNT: int(user_input.get(CONF_COUNT, DEFAULT_COUNT)),
+                    "rss_url": feed_urls[0]
+                }
+                return self.async_create_entry(title=f"112odin aggregate ({len(feed_urls)} feeds)", data=data)
+            errors["base"] = "no_feeds"
+
+        schema = vol.Schema({
+            vol.Required(CONF_FEED_URLS, default=DEFAULT_RSS_URL): str,
+            vol.Optional(CONF_COUNT, default=DEFAULT_COUNT): vol.All(int, vol.Range(min=1, max=20))
+        })
+        return self.async_show_form(step_id="aggregate", data_schema=schema, errors=errors)
+
+
+def parse_feed_urls(text: str) -> List[str]:
+    """One URL per line or comma separated, without blanks or repeats."""
+    urls: Dict[str, None] = {}
+    for url in text.replace(",", "\n").splitlines():
+        url = url.strip().rstrip('/')
+        if url:
+            urls[url] = None
+    return list(urls)
@@ -5,3 +5,57 @@ CONF_BEREDSKABSID = "beredskabsID"
 CONF_STATION = "station"
 CONF_COUNT = "count"
 DEFAULT_RSS_URL = "http://www.odin.dk/RSS/RSS.aspx"
+DEFAULT_SCAN_INTERVAL = 30
+DATA_COORDINATORS = "coordinators"
+EVENT_NEW_ALARM = "112odin_new_alarm"
+CONF_SCAN_FLOOR = "scan_floor"
+CONF_SCAN_CEILING = "scan_ceiling"
+DEFAULT_SCAN_FLOOR = 10
+DEFAULT_SCAN_CEILING = 120
+CONF_FETCH_MODE = "fetch_mode"
+FETCH_MODE_QUERY = "query"
+FETCH_MODE_LOCAL = "local"
+SHARED_FEED_COUNT = 200
+DATA_FEED_CACHE = "feed_cache"
+FEED_CACHE_TTL = 60
+DATA_SNAPSHOTS = "snapshots"
+STORAGE_VERSION = 1
+DATA_BREAKERS = "breakers"
+DATA_HISTORY = "history"
+DATA_HISTORY_LIMITS = "history_limits"
+HISTORY_FILE = "112odin_history.db"
+CONF_HISTORY_DAYS = "history_days"
+CONF_HISTORY_MAX_ROWS = "history_max_rows"
+SERVICE_QUERY_HISTORY = "query_history"
+DATA_STATS = "stats"
+SIGNAL_STATS_UPDATED = "112odin_alarner_stats_{}"
+SIGNAL_LATEST_UPDATED = "112odin_alarner_latest_{}"
+CONF_ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_AGGREGATE = "aggregate"
+CONF_FEED_URLS = "feed_urls"
+DATA_HOST_LIMITS = "host_limits"
+HOST_CONCURRENCY = 2
+
+CONF_INGEST_MODE = "ingest_mode"
+INGEST_MODE_POLL = "poll"
+INGEST_MODE_PUSH = "push"
+CONF_WEBHOOK_ID = "webhook_id"
+# With a relay pushing, polling is only a consistency check.
+PUSH_CHECK_INTERVAL = 900
+
+DATA_SESSION = "session"
+
+CONF_MAX_BODY_KB = "max_body_kb"
+DEFAULT_MAX_BODY_KB = 1024
+
+DATA_STARTUP = "startup"
+# Seconds; exceeding either is logged as a warning and shown in diagnostics.
+IMPORT_BUDGET = 0.25
+SETUP_BUDGET = 0.5
+DATA_SCHEDULER = "scheduler"
+DATA_PARSE_POOL = "parse_pool"
+
+CONF_INCLUDE_CATEGORIES = "include_categories"
+CONF_EXCLUDE_CATEGORIES = "exclude_categories"
+# With category filters, fetch this many times `count` so enough items survive.
+FILTER_OVERFETCH = 5
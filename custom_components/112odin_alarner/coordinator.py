@@ -0,0 +1,471 @@
+"""Shared per-URL coordinator so identical ODIN queries are fetched and parsed once."""
+from __future__ import annotations
+import asyncio
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from .breaker import CircuitBreaker
+from .cache import FeedCache
+from .classifier import CategoryClassifier
+from .client import LOCAL_ERRORS, FeedResponse, async_guarded_request, trace_config
+from .const import (
+    DOMAIN, DATA_COORDINATORS, DEFAULT_SCAN_INTERVAL, DEFAULT_SCAN_FLOOR, DEFAULT_SCAN_CEILING, SHARED_FEED_COUNT,
+    DATA_FEED_CACHE, FEED_CACHE_TTL, DATA_BREAKERS, DATA_HOST_LIMITS, HOST_CONCURRENCY,
+    PUSH_CHECK_INTERVAL, DATA_SESSION, DEFAULT_MAX_BODY_KB, DATA_SCHEDULER, FILTER_OVERFETCH, DATA_PARSE_POOL,
+)
+from .extract import item_ids
+from .history import AlarmHistory, records_from_items
+from .index import FeedIndex, normalize_items
+from .merge import dedupe_keys, merge_feeds
+from .metrics import FeedMetrics
+from .parser import MAX_BODY_BYTES
+from .parsepool import ParsePool
+from .ratelimit import RequestScheduler
+from .scheduler import AdaptiveInterval
+from .seen import item_key
+from .snapshot import SnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """The integration's pooled client session, traced for fetch metrics."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    session = domain_data.get(DATA_SESSION)
+    if session is None:
+        session = domain_data[DATA_SESSION] = async_create_clientsession(hass, trace_configs=[trace_config()])
+    return session
+
+
+def get_breaker(hass: HomeAssistant, rss_url: str) -> CircuitBreaker:
+    """One breaker per ODIN endpoint, shared by coordinators and flows."""
+    breakers: Dict[str, CircuitBreaker] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_BREAKERS, {})
+    breaker = breakers.get(rss_url)
+    if breaker is None:
+        breaker = breakers[rss_url] = CircuitBreaker()
+    return breaker
+
+
+def get_feed_cache(hass: HomeAssistant) -> FeedCache:
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_FEED_CACHE, FeedCache(FEED_CACHE_TTL))
+
+
+def get_scheduler(hass: HomeAssistant) -> RequestScheduler:
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SCHEDULER, RequestScheduler())
+
+
+def get_parse_pool(hass: HomeAssistant) -> ParsePool:
+    """The integration's own threads for feedparser fallbacks, kept off HA's shared executor."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    pool = domain_data.get(DATA_PARSE_POOL)
+    if pool is None:
+        pool = domain_data[DATA_PARSE_POOL] = ParsePool()
+
+        @callback
+        def _async_shutdown(_event) -> None:
+            pool.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return pool
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _host_limit(hass: HomeAssistant, url: str) -> asyncio.Semaphore:
+    limits: Dict[str, asyncio.Semaphore] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_HOST_LIMITS, {})
+    host = _host(url)
+    limit = limits.get(host)
+    if limit is None:
+        limit = limits[host] = asyncio.Semaphore(HOST_CONCURRENCY)
+    return limit
+
+
+async def async_shared_request(hass: HomeAssistant, url: str, count: int | None,
+                               metrics: FeedMetrics | None = None, max_bytes: int = MAX_BODY_BYTES,
+                               headers: Dict[str, str] | None = None, priority: float = 0.0) -> FeedResponse:
+    """Guarded GET of `url` on the integration's session, breakers, scheduler, host limits and parse pool.
+
+    Every fetch in the integration goes through here. Lower `priority` is served first.
+    """
+    breaker = get_breaker(hass, url.split('?', 1)[0].rstrip('/'))
+    return await async_guarded_request(get_session(hass), url, count, breaker, get_scheduler(hass),
+                                       _host_limit(hass, url), metrics, max_bytes, headers, get_parse_pool(hass),
+                                       priority)
+
+
+async def async_fetch_items(hass: HomeAssistant, url: str, count: int | None, metrics: FeedMetrics | None = None,
+                            max_bytes: int = MAX_BODY_BYTES, priority: float = 0.0) -> List[Dict[str, Any]]:
+    """Unconditional guarded GET of `url`, parsed to items.
+
+    The default priority puts interactive callers (the flows) ahead of polls.
+    """
+    response = await async_shared_request(hass, url, count, metrics, max_bytes, priority=priority)
+    return response.items
+
+
+async def async_get_feed(hass: HomeAssistant, url: str) -> List[Dict[str, Any]]:
+    """Return all items of `url`, served from the shared cache when fresh."""
+    return await get_feed_cache(hass).async_get(url, lambda: async_fetch_items(hass, url, None))
+
+
+class Subscription(NamedTuple):
+    count: int
+    scan_floor: int = DEFAULT_SCAN_FLOOR
+    scan_ceiling: int = DEFAULT_SCAN_CEILING
+    # Answer from the unfiltered feed's index instead of a server-side query.
+    local_filter: bool = False
+    # Aggregate entries: the feeds merged into one stream.
+    feed_urls: Tuple[str, ...] = ()
+    # Items arrive through the webhook; polling only double-checks.
+    push: bool = False
+    max_body_kb: int = DEFAULT_MAX_BODY_KB
+    classifier: Optional[CategoryClassifier] = None
+
+    @property
+    def filtered(self) -> bool:
+        return self.classifier is not None and self.classifier.active
+
+    @property
+    def fetch_count(self) -> int:
+        """Items to request so that `count` remain after local filtering."""
+        if self.local_filter:
+            return SHARED_FEED_COUNT
+        if self.filtered:
+            return min(SHARED_FEED_COUNT, self.count * FILTER_OVERFETCH)
+        return self.count
+
+
+def build_query(beredskabsID: str | None, station: str | None) -> List[str]:
+    params = []
+    if beredskabsID:
+        params.append(f"beredskabsID={beredskabsID}")
+    if station:
+        params.append(f"enhed={station}")
+    return params
+
+
+def feed_key(rss_url: str, beredskabsID: str | None, station: str | None) -> str:
+    """Key shared by all entries asking the same feed; `antal` is left out on purpose."""
+    return f"{rss_url.rstrip('/')}?" + "&".join(build_query(beredskabsID, station))
+
+
+class OdinFeedCoordinator(DataUpdateCoordinator[List[Dict[str, Any]]]):
+    """Fetch one ODIN query per interval and fan the items out to every subscribed entry.
+
+    Entries that only differ in `count` overlap, so the feed is requested with the
+    largest count among subscribers and each sensor slices its own share. The
+    unfiltered coordinator also indexes its items so local-filter entries for any
+    beredskabsID/station can be answered from a single request.
+    """
+
+    def __init__(self, hass: HomeAssistant, rss_url: str, beredskabsID: str | None, station: str | None) -> None:
+        self.rss_url = rss_url.rstrip('/')
+        self.key = feed_key(rss_url, beredskabsID, station)
+        self.beredskabsID = beredskabsID
+        self.station = station
+        # Shared by several entries, so it must not adopt whichever entry happened to create it:
+        # that entry's unload would shut it down for every other subscriber.
+        super().__init__(hass, _LOGGER, config_entry=None, name=f"{DOMAIN} {self.key}",
+                         update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL))
+        self._query = build_query(beredskabsID, station)
+        self._subscribers: Dict[str, Subscription] = {}
+        self._interval = AdaptiveInterval(DEFAULT_SCAN_FLOOR, DEFAULT_SCAN_CEILING, DEFAULT_SCAN_INTERVAL, self.key)
+        self._inflight: Optional[asyncio.Task] = None
+        self._inflight_count = 0
+        self.index: FeedIndex | None = None
+        self.snapshots: SnapshotStore | None = None
+        self.history: AlarmHistory | None = None
+        self._validator_url: str | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._body_hash: bytes | None = None
+        self.metrics = FeedMetrics()
+
+    @property
+    def count(self) -> int:
+        return max((sub.fetch_count for sub in self._subscribers.values()), default=1)
+
+    @property
+    def max_body(self) -> int:
+        # Shared feeds honour the most generous cap so no subscriber starves another.
+        return max((sub.max_body_kb for sub in self._subscribers.values()), default=DEFAULT_MAX_BODY_KB) * 1024
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def restore(self, items: List[Dict[str, Any]]) -> None:
+        """Seed data from a persisted snapshot before the first fetch."""
+        self.data = normalize_items(items)
+        self.index = FeedIndex(self.data)
+
+    def items_for(self, beredskabsID: str | None, station: str | None, count: int) -> List[Dict[str, Any]]:
+        if self.data is None:
+            return []
+        if self._query or self.index is None:
+            return self.data[:count]
+        return self.index.lookup(beredskabsID, station, count)
+
+    def items_since(self, beredskabsID: str | None, station: str | None, since: float) -> List[Dict[str, Any]]:
+        """Items published at or after epoch `since`, newest first, found by binary search."""
+        if self.index is None:
+            return []
+        if self._query:
+            # The server already applied the filter.
+            beredskabsID = station = None
+        return self.index.since(since, beredskabsID, station)
+
+    def url_for(self, count: int) -> str:
+        return f"{self.rss_url}?" + "&".join(self._query + [f"antal={count}"])
+
+    def subscribe(self, entry_id: str, subscription: Subscription) -> bool:
+        """Register an entry; return True when the current data cannot serve it yet."""
+        previous = self.count if self._subscribers else 0
+        self._subscribers[entry_id] = subscription
+        self._configure_interval()
+        return self.data is None or subscription.fetch_count > previous
+
+    def subscription_for(self, entry_id: str) -> Subscription | None:
+        return self._subscribers.get(entry_id)
+
+    def unsubscribe(self, entry_id: str) -> None:
+        self._subscribers.pop(entry_id, None)
+        self._configure_interval()
+
+    def _configure_interval(self) -> None:
+        # The most demanding subscriber sets the pace for everyone sharing the feed.
+        if not self._subscribers:
+            return
+        subs = self._subscribers.values()
+        if all(sub.push for sub in subs):
+            self._interval.configure(PUSH_CHECK_INTERVAL, PUSH_CHECK_INTERVAL)
+            return
+        self._interval.configure(min(sub.scan_floor for sub in subs), min(sub.scan_ceiling for sub in subs))
+
+    def _reschedule(self, activity: bool) -> None:
+        self.update_interval = timedelta(seconds=self._interval.next(activity))
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        if url != self._validator_url:
+            # Validators belong to one exact URL; a different `antal` starts over.
+            self._validator_url = url
+            self._etag = self._last_modified = None
+            self._body_hash = None
+            return {}
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    async def _fetch(self, url: str, count: int) -> Optional[Tuple[List[Dict[str, Any]], bytes]]:
+        """Stream and parse the feed, returning the items and the bytes read.
+
+        Returns None when the server says the feed is unchanged (304). Makes a
+        single attempt; retries are left to the coordinator's schedule so no
+        task sits sleeping on the event loop.
+        """
+        # Feeds polled at their floor (recent activity) are served first.
+        response = await async_shared_request(self.hass, url, count, self.metrics, self.max_body,
+                                              self._conditional_headers(url), self._interval.current)
+        if response.items is None:
+            if self.data is None:
+                raise aiohttp.ClientError(f"HTTP 304 for {url} with nothing cached")
+            self.metrics.count("not_modified")
+            return None
+        self._etag = response.etag
+        self._last_modified = response.last_modified
+        return response.items, response.consumed
+
+    def _retry_delay(self, err: Exception) -> float:
+        """Seconds until the next attempt after a failed fetch."""
+        if isinstance(err, LOCAL_ERRORS):
+            # These never reach the breaker, whose `retry_in` would then say one second
+            # forever (and a full parse pool would be refilled at once); back off on the
+            # feed's own schedule instead.
+            return self._interval.next(False)
+        # The next scheduled refresh is the retry (or the half-open probe).
+        return get_breaker(self.hass, self.rss_url).retry_in()
+
+    async def _async_fetch_and_parse(self, count: int) -> List[Dict[str, Any]]:
+        cache = get_feed_cache(self.hass)
+        if not self._query and self.data is None:
+            # A setup wizard usually fetched the unfiltered feed moments ago.
+            cached = cache.get(self.rss_url)
+            if cached is not None:
+                self.metrics.count("cache_hits")
+                items = normalize_items(cached[:count])
+                self.index = FeedIndex(items)
+                return items
+        try:
+            result = await self._fetch(self.url_for(count), count)
+        except Exception as err:
+            retry_in = self._retry_delay(err)
+            self.update_interval = timedelta(seconds=retry_in)
+            if self.data is None:
+                raise UpdateFailed(f"Fetching {self.key} failed: {err}") from err
+            _LOGGER.warning("Fetching %s failed (%s); keeping last good data, next attempt in %.0fs", self.key, err, retry_in)
+            return self.data
+        if result is None:
+            self._reschedule(False)
+            return self.data
+        items, consumed = result
+        # Servers without validators still send identical bodies on quiet polls.
+        # Only the bytes read before the parser stopped are hashed, which covers
+        # exactly the items we keep.
+        body_hash = hashlib.blake2b(consumed, digest_size=16).digest()
+        if body_hash == self._body_hash and self.data is not None:
+            self.metrics.count("unchanged")
+            self._reschedule(False)
+            return self.data
+        self._body_hash = body_hash
+        known = {item_key(item) for item in self.data or []}
+        self._reschedule(self.data is not None and any(item_key(item) not in known for item in items))
+        self.index = FeedIndex(normalize_items(items, previous=self.data))
+        if not self._query and count >= SHARED_FEED_COUNT:
+            # The flows read this entry as the whole feed; a shorter fetch would truncate their pickers.
+            cache.put(self.rss_url, items)
+        self._persist(items)
+        return items
+
+    def _persist(self, items: List[Dict[str, Any]]) -> None:
+        if self.snapshots is not None:
+            self.snapshots.async_save(self.key, items)
+        if self.history is not None:
+            subs = list(self._subscribers.values())
+            if subs and all(sub.filtered for sub in subs):
+                # Keep only what at least one entry wants; unfiltered entries want everything.
+                items = [item for item in items if any(sub.classifier.accepts(item) for sub in subs)]
+            self.hass.async_add_executor_job(self.history.add, records_from_items(items, self._item_ids))
+
+    def _accepts(self, item: Dict[str, Any]) -> bool:
+        # A relay may push everything; keep what this feed's query would have returned.
+        beredskabsID, station = item_ids(item)
+        return (not self.beredskabsID or beredskabsID in (None, self.beredskabsID)) and \
+            (not self.station or station in (None, self.station))
+
+    @callback
+    def async_ingest(self, items: List[Dict[str, Any]]) -> int:
+        """Merge pushed items into the current data and notify listeners; return how many were new."""
+        current = self.data or []
+        known = {key for item in current for key in dedupe_keys(item)}
+        new = [item for item in items if self._accepts(item) and not any(key in known for key in dedupe_keys(item))]
+        if not new:
+            return 0
+        items = merge_feeds([current, new], max(self.count, len(current)))
+        self.index = FeedIndex(items)
+        self._persist(items)
+        self._reschedule(True)
+        self.async_set_updated_data(items)
+        return len(new)
+
+    def _item_ids(self, item: Dict[str, Any]) -> Tuple[str | None, str | None]:
+        # A filtered query knows what it asked for even when the item does not say.
+        beredskabsID, station = item_ids(item)
+        return beredskabsID or self.beredskabsID, station or self.station
+
+    async def _async_update_data(self) -> List[Dict[str, Any]]:
+        # Concurrent refreshes (e.g. several entries set up at once) join the running
+        # request unless it was started for fewer items than are now needed.
+        count = self.count
+        if self._inflight is None or self._inflight.done() or self._inflight_count < count:
+            self._inflight = self.hass.async_create_task(self._async_fetch_and_parse(count))
+            self._inflight_count = count
+        return await asyncio.shield(self._inflight)
+
+
+def aggregate_key(feed_urls: Tuple[str, ...]) -> str:
+    return "aggregate:" + "|".join(sorted(url.rstrip('/') for url in feed_urls))
+
+
+class OdinAggregateCoordinator(OdinFeedCoordinator):
+    """Fetch several feeds concurrently and publish one merged, deduplicated stream.
+
+    All feeds go out at once on HA's pooled session, throttled only by the
+    per-host limit, so a refresh takes as long as the slowest feed rather than
+    the sum of all of them. A failing feed is skipped as long as another one
+    answers.
+    """
+
+    def __init__(self, hass: HomeAssistant, feed_urls: Tuple[str, ...]) -> None:
+        super().__init__(hass, feed_urls[0], None, None)
+        self.feed_urls = tuple(url.rstrip('/') for url in feed_urls)
+        self.key = aggregate_key(feed_urls)
+        self.name = f"{DOMAIN} {self.key}"
+
+    def url_for(self, count: int) -> str:
+        return "|".join(self.feed_urls)
+
+    async def _async_fetch_and_parse(self, count: int) -> List[Dict[str, Any]]:
+        results = await asyncio.gather(
+            *(async_fetch_items(self.hass, url, count, self.metrics, self.max_body, self._interval.current)
+              for url in self.feed_urls), return_exceptions=True
+        )
+        feeds = []
+        for url, result in zip(self.feed_urls, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Fetching %s failed: %s", url, result)
+            else:
+                feeds.append(result)
+        if not feeds:
+            # Only feeds that reached the server have a breaker worth asking.
+            breakers = [get_breaker(self.hass, url.split('?', 1)[0].rstrip('/'))
+                        for url, result in zip(self.feed_urls, results) if not isinstance(result, LOCAL_ERRORS)]
+            self.update_interval = timedelta(seconds=min(breaker.retry_in() for breaker in breakers)
+                                             if breakers else self._interval.next(False))
+            if self.data is None:
+                raise UpdateFailed(f"All feeds of {self.key} failed")
+            return self.data
+        items = merge_feeds(feeds, count, previous=self.data)
+        known = {item_key(item) for item in self.data or []}
+        if self.data is not None and [item_key(item) for item in items] == [item_key(item) for item in self.data]:
+            self.metrics.count("unchanged")
+            self._reschedule(False)
+            return self.data
+        self._reschedule(self.data is not None and any(item_key(item) not in known for item in items))
+        self.index = FeedIndex(items)
+        self._persist(items)
+        return items
+
+
+def coordinator_key(rss_url: str, beredskabsID: str | None, station: str | None, subscription: Subscription) -> str:
+    if subscription.feed_urls:
+        return aggregate_key(subscription.feed_urls)
+    if subscription.local_filter:
+        beredskabsID = station = None
+    return feed_key(rss_url, beredskabsID, station)
+
+
+def async_get_coordinator(hass: HomeAssistant, entry_id: str, rss_url: str, beredskabsID: str | None,
+                          station: str | None, subscription: Subscription) -> tuple[OdinFeedCoordinator, bool]:
+    """Return the shared coordinator for this query and whether it needs a refresh."""
+    coordinators: Dict[str, OdinFeedCoordinator] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    key = coordinator_key(rss_url, beredskabsID, station, subscription)
+    coordinator = coordinators.get(key)
+    if coordinator is None and subscription.feed_urls:
+        coordinator = coordinators[key] = OdinAggregateCoordinator(hass, subscription.feed_urls)
+    elif coordinator is None:
+        if subscription.local_filter:
+            beredskabsID = station = None
+        coordinator = coordinators[key] = OdinFeedCoordinator(hass, rss_url, beredskabsID, station)
+    needs_refresh = coordinator.subscribe(entry_id, subscription)
+    return coordinator, needs_refresh
+
+
+async def async_release_coordinator(hass: HomeAssistant, entry_id: str, coordinator: OdinFeedCoordinator) -> None:
+    """Drop an entry's subscription and tear the coordinator down with the last one."""
+    coordinator.unsubscribe(entry_id)
+    if coordinator.has_subscribers:
+        return
+    hass.data[DOMAIN][DATA_COORDINATORS].pop(coordinator.key, None)
+    await coordinator.async_shutdown()
@@ -0,0 +1,32 @@
+"""Diagnostics download: the entry's setup, its shared coordinator, fetch metrics and the parse pool."""
+from __future__ import annotations
+from typing import Any, Dict
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, CONF_WEBHOOK_ID, DATA_STARTUP
+from .coordinator import get_breaker, get_parse_pool
+
+# The webhook id is the only secret: anyone holding it can push alarms.
+TO_REDACT = {CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry) -> Dict[str, Any]:
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    breaker = get_breaker(hass, coordinator.rss_url)
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "key": coordinator.key,
+            "count": coordinator.count,
+            "items": len(coordinator.data or []),
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        },
+        "breaker": {"state": breaker.state, "failures": breaker.failures, "cooldown": breaker.cooldown},
+        "metrics": coordinator.metrics.as_dict(),
+        "parse_pool": get_parse_pool(hass).as_dict(),
+        "startup": hass.data[DOMAIN].get(DATA_STARTUP, {}).get(entry.entry_id),
+    }
@@ -0,0 +1,42 @@
+"""Event platform: one event entity per entry that fires for every new alarm."""
+from __future__ import annotations
+from typing import Any, Dict
+from homeassistant.components.event import EventEntity
+from homeassistant.core import Event, callback
+from .const import DEFAULT_NAME, EVENT_NEW_ALARM
+
+EVENT_TYPE_NEW_ALARM = "new_alarm"
+
+PARALLEL_UPDATES = 0
+
+# Keys of the bus event copied onto the entity; everything else stays on the bus.
+_ALARM_KEYS = ("title", "description", "published", "link", "guid", "beredskabsID", "station")
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    async_add_entities([OdinAlarmEvent(entry.entry_id)])
+
+class OdinAlarmEvent(EventEntity):
+    """Carries one alarm per state change instead of the whole list."""
+
+    _attr_event_types = [EVENT_TYPE_NEW_ALARM]
+    _attr_should_poll = False
+
+    def __init__(self, entry_id: str) -> None:
+        self._entry_id = entry_id
+        self._attr_name = f"{DEFAULT_NAME} alarm"
+        self._attr_unique_id = f"112odin_{entry_id}_alarm"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.hass.bus.async_listen(EVENT_NEW_ALARM, self._handle_new_alarm, event_filter=self._is_ours)
+        )
+
+    @callback
+    def _is_ours(self, event_data: Dict[str, Any]) -> bool:
+        return event_data.get("entry_id") == self._entry_id
+
+    @callback
+    def _handle_new_alarm(self, event: Event) -> None:
+        self._trigger_event(EVENT_TYPE_NEW_ALARM, {key: event.data.get(key) for key in _ALARM_KEYS})
+        self.async_write_ha_state()
@@ -0,0 +1,52 @@
+"""Single-pass extraction of beredskabsID and station values from feed items."""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# beredskabsID -> stations, both in first-seen feed order (dicts double as ordered sets).
+StationMap = Dict[str, Dict[str, None]]
+
+
+def item_ids(item: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (beredskabsID, station) for an item.
+
+    The link query string is parsed once; the summary is only searched for a
+    beredskabsID and the title prefix only used for a station when the link
+    does not carry them.
+    """
+    query = parse_qs(urlsplit(item.get("link") or "").query)
+    beredskabsID = (query.get("beredskabsID") or [None])[0]
+    station = (query.get("enhed") or [None])[0]
+    if not beredskabsID:
+        summary = item.get("summary") or ""
+        if "beredskabsID=" in summary:
+            beredskabsID = summary.split("beredskabsID=", 1)[1].split("&", 1)[0] or None
+    if not station:
+        title = item.get("title") or ""
+        if "-" in title:
+            station = title.split("-", 1)[0].strip() or None
+    return beredskabsID, station
+
+
+def build_station_map(items: Iterable[Dict[str, Any]]) -> StationMap:
+    """Map every beredskabsID to its stations; items without an ID land under ""."""
+    mapping: StationMap = {}
+    for item in items:
+        beredskabsID, station = item_ids(item)
+        stations = mapping.setdefault(beredskabsID or "", {})
+        if station:
+            stations[station] = None
+    return mapping
+
+
+def beredskabs_ids(mapping: StationMap) -> List[str]:
+    return [beredskabsID for beredskabsID in mapping if beredskabsID]
+
+
+def stations_for(mapping: StationMap, beredskabsID: str | None) -> List[str]:
+    if beredskabsID:
+        return list(mapping.get(beredskabsID, {}))
+    merged: Dict[str, None] = {}
+    for stations in mapping.values():
+        merged.update(stations)
+    return list(merged)
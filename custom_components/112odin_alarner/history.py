@@ -0,0 +1,164 @@
+"""Bounded on-disk alarm history (SQLite) with a hot in-memory window.
+
+All methods are blocking and meant to run in an executor; a lock serialises
+access to the single connection.
+"""
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional
+from .timestamps import item_epoch
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_MAX_ROWS = 5000
+HOT_SIZE = 1000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS alarms ("
+    " key TEXT PRIMARY KEY, beredskabsID TEXT, station TEXT, published REAL NOT NULL, title TEXT, link TEXT)",
+    "CREATE INDEX IF NOT EXISTS alarms_station_published ON alarms (station, published)",
+    "CREATE INDEX IF NOT EXISTS alarms_published ON alarms (published)",
+)
+
+
+class AlarmRecord:
+    __slots__ = ("key", "beredskabsID", "station", "published", "title", "link")
+
+    def __init__(self, key: str, beredskabsID: str | None, station: str | None, published: float,
+                 title: str | None, link: str | None) -> None:
+        self.key = key
+        self.beredskabsID = beredskabsID
+        self.station = station
+        self.published = published
+        self.title = title
+        self.link = link
+
+    def as_row(self) -> tuple:
+        return (self.key, self.beredskabsID, self.station, self.published, self.title, self.link)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _published(record: AlarmRecord) -> float:
+    return record.published
+
+
+class AlarmHistory:
+    """Dedupe alarms by key, keep the newest `hot_size` in memory and the rest on disk."""
+
+    def __init__(self, path: str, retention_days: int = DEFAULT_RETENTION_DAYS,
+                 max_rows: int = DEFAULT_MAX_ROWS, hot_size: int = HOT_SIZE) -> None:
+        self._path = path
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self._hot_size = hot_size
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Both sorted by published time; `_hot_complete` means the disk holds nothing older.
+        self._hot: List[AlarmRecord] = []
+        self._by_station: Dict[str, List[AlarmRecord]] = {}
+        self._keys: set = set()
+        self._hot_complete = True
+
+    def open(self) -> None:
+        with self._lock:
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._prune(time.time())
+            rows = self._conn.execute(
+                "SELECT key, beredskabsID, station, published, title, link FROM alarms ORDER BY published DESC LIMIT ?",
+                (self._hot_size + 1,),
+            ).fetchall()
+            self._hot_complete = len(rows) <= self._hot_size
+            for row in reversed(rows[: self._hot_size]):
+                self._remember(AlarmRecord(*row))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def add(self, records: Iterable[AlarmRecord]) -> int:
+        """Store records not seen before; return how many were new."""
+        with self._lock:
+            candidates = [record for record in records if record.key not in self._keys]
+            if not candidates or self._conn is None:
+                return 0
+            new = 0
+            for record in candidates:
+                # The key set only covers the hot window; the primary key catches older duplicates.
+                if self._conn.execute("INSERT OR IGNORE INTO alarms VALUES (?, ?, ?, ?, ?, ?)", record.as_row()).rowcount:
+                    self._remember(record)
+                    new += 1
+            self._prune(time.time())
+            self._conn.commit()
+            return new
+
+    def query(self, station: str | None = None, beredskabsID: str | None = None,
+              since: float = 0.0, limit: int = 100) -> List[AlarmRecord]:
+        """Newest-first records published at or after `since`."""
+        with self._lock:
+            if self._hot_complete or (self._hot and since >= self._hot[0].published):
+                source = self._by_station.get(station, []) if station else self._hot
+                start = bisect_left(source, since, key=_published)
+                matches = [r for r in reversed(source[start:]) if not beredskabsID or r.beredskabsID == beredskabsID]
+                return matches[:limit]
+            if self._conn is None:
+                return []
+            sql = "SELECT key, beredskabsID, station, published, title, link FROM alarms WHERE published >= ?"
+            args: list = [since]
+            if station:
+                sql += " AND station = ?"
+                args.append(station)
+            if beredskabsID:
+                sql += " AND beredskabsID = ?"
+                args.append(beredskabsID)
+            sql += " ORDER BY published DESC LIMIT ?"
+            args.append(limit)
+            return [AlarmRecord(*row) for row in self._conn.execute(sql, args)]
+
+    def _remember(self, record: AlarmRecord) -> None:
+        self._keys.add(record.key)
+        insort(self._hot, record, key=_published)
+        if record.station:
+            insort(self._by_station.setdefault(record.station, []), record, key=_published)
+        while len(self._hot) > self._hot_size:
+            self._forget(self._hot[0])
+            self._hot_complete = False
+
+    def _forget(self, record: AlarmRecord) -> None:
+        self._hot.remove(record)
+        self._keys.discard(record.key)
+        if record.station:
+            self._by_station[record.station].remove(record)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.retention_days * 86400
+        self._conn.execute("DELETE FROM alarms WHERE published < ?", (cutoff,))
+        self._conn.execute(
+            "DELETE FROM alarms WHERE key IN (SELECT key FROM alarms ORDER BY published DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+        while self._hot and self._hot[0].published < cutoff:
+            self._forget(self._hot[0])
+        while len(self._hot) > self.max_rows:
+            self._forget(self._hot[0])
+
+
+def records_from_items(items: Iterable[Dict[str, Any]], ids, now: Optional[float] = None) -> List[AlarmRecord]:
+    """Turn feed items into records; `ids` maps an item to (beredskabsID, station)."""
+    now = time.time() if now is None else now
+    records = []
+    for item in items:
+        key = item.get("guid") or item.get("link")
+        if not key:
+            continue
+        beredskabsID, station = ids(item)
+        records.append(AlarmRecord(key, beredskabsID, station, item_epoch(item, now),
+                                   item.get("title"), item.get("link")))
+    return records
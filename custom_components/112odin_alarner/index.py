@@ -0,0 +1,76 @@
+"""In-memory index of feed items by beredskabsID and station, newest first."""
+from __future__ import annotations
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .extract import item_ids
+from .seen import item_key
+from .timestamps import TS_KEY, parse_published
+
+
+def _newest_first(item: Dict[str, Any]) -> float:
+    return -item[TS_KEY]
+
+
+def normalize_items(items: List[Dict[str, Any]], now: Optional[float] = None,
+                    previous: Optional[Iterable[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Stamp `published_ts` on every item and sort the list in place, newest first.
+
+    Items without a usable date count as published when first seen: the stamp
+    they got in `previous` (the last normalized list), else `now`. The sort is
+    stable and the feed is normally in order already, so this is a single pass.
+    """
+    now = time.time() if now is None else now
+    first_seen: Optional[Dict[Optional[str], float]] = None
+    for item in items:
+        if TS_KEY in item:
+            continue
+        ts = parse_published(item.get("published"))
+        if ts is None:
+            if first_seen is None:
+                first_seen = {item_key(old): old[TS_KEY] for old in previous or () if TS_KEY in old}
+            ts = first_seen.get(item_key(item), now)
+        item[TS_KEY] = ts
+    items.sort(key=_newest_first)
+    return items
+
+
+class FeedIndex:
+    """Buckets of items keyed by beredskabsID, station and the pair, in feed order.
+
+    Built once per fetched feed so each sensor lookup costs O(matching items).
+    Expects `normalize_items` output, so every bucket is newest first and
+    `since` is a binary search.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]]) -> None:
+        self._all = items
+        self._by_id: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_station: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_pair: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for item in items:
+            beredskabsID, station = item_ids(item)
+            if beredskabsID:
+                self._by_id.setdefault(beredskabsID, []).append(item)
+            if station:
+                self._by_station.setdefault(station, []).append(item)
+            if beredskabsID and station:
+                self._by_pair.setdefault((beredskabsID, station), []).append(item)
+
+    def _bucket(self, beredskabsID: str | None, station: str | None) -> List[Dict[str, Any]]:
+        if beredskabsID and station:
+            return self._by_pair.get((beredskabsID, station), [])
+        if beredskabsID:
+            return self._by_id.get(beredskabsID, [])
+        if station:
+            return self._by_station.get(station, [])
+        return self._all
+
+    def lookup(self, beredskabsID: str | None, station: str | None, count: int) -> List[Dict[str, Any]]:
+        """The newest `count` matching items."""
+        return self._bucket(beredskabsID, station)[:count]
+
+    def since(self, ts: float, beredskabsID: str | None = None, station: str | None = None) -> List[Dict[str, Any]]:
+        """Matching items published at or after epoch `ts`, newest first, in O(log n)."""
+        bucket = self._bucket(beredskabsID, station)
+        return bucket[:bisect_right(bucket, -ts, key=_newest_first)]
@@ -0,0 +1,74 @@
+"""Decode items pushed by a relay: a single RSS <item>, a whole RSS document, or JSON."""
+from __future__ import annotations
+import json
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional
+from xml.etree.ElementTree import ParseError
+from .parser import parse_bytes
+from .timestamps import TS_KEY
+
+MAX_PUSH_ITEMS = 200
+
+
+def _text(obj: Dict[str, Any], *names: str) -> Optional[str]:
+    # Relays send numeric ids as JSON numbers; everything downstream expects text.
+    for name in names:
+        value = obj.get(name)
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"'{name}' must be a string or a number")
+        return str(value)
+    return None
+
+
+def _from_json(obj: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(obj, dict):
+        raise ValueError("JSON items must be objects")
+    description = _text(obj, "description", "summary")
+    item = {
+        "title": _text(obj, "title"),
+        "description": description,
+        "summary": description,
+        "published": "",
+        "link": _text(obj, "link"),
+        "guid": _text(obj, "guid", "id"),
+    }
+    published = obj.get("published") or obj.get("pubDate")
+    if isinstance(published, (int, float)) and not isinstance(published, bool):
+        # Epoch seconds: keep the exact value and give the item a feed-style date.
+        item["published"] = formatdate(published, usegmt=True)
+        item[TS_KEY] = float(published)
+    elif published:
+        item["published"] = _text(obj, "published", "pubDate")
+    return item
+
+
+def parse_push_body(body: bytes, content_type: str = "") -> List[Dict[str, Any]]:
+    """Return pushed items in the same shape the feed parser produces.
+
+    JSON may be one item object, a list of them, or ``{"items": [...]}``.
+    Anything else is parsed as RSS. JSON fields may be numbers (ids as text,
+    ``published`` as epoch seconds). Raises ValueError on undecodable bodies,
+    on fields of other types and on items with neither a link nor a guid,
+    which could never be deduplicated.
+    """
+    text = body.lstrip()
+    if "json" in content_type or text[:1] in (b"{", b"["):
+        try:
+            payload = json.loads(body)
+        except ValueError as err:
+            raise ValueError(f"Invalid JSON: {err}") from err
+        if isinstance(payload, dict) and "items" in payload:
+            payload = payload["items"]
+        items = [_from_json(obj) for obj in (payload if isinstance(payload, list) else [payload])]
+    else:
+        try:
+            items = [item.as_dict() for item in parse_bytes(body, None)]
+        except ParseError as err:
+            raise ValueError(f"Invalid RSS: {err}") from err
+    if len(items) > MAX_PUSH_ITEMS:
+        raise ValueError(f"At most {MAX_PUSH_ITEMS} items per push")
+    if any(not (item["link"] or item["guid"]) for item in items):
+        raise ValueError("Every item needs a link or a guid")
+    return items
@@ -0,0 +1,45 @@
+"""Merge several ODIN feeds into one newest-first stream without duplicates."""
+from __future__ import annotations
+import time
+from typing import Any, Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from .index import normalize_items
+from .timestamps import TS_KEY
+
+
+def normalize_link(link: str) -> str:
+    """Case-fold scheme/host, drop the fragment and trailing slash, sort the query."""
+    parts = urlsplit(link.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ""))
+
+
+def dedupe_keys(item: Dict[str, Any]) -> List[str]:
+    # Mirrors do not always carry both, so an item is a duplicate if either matches.
+    keys = []
+    if item.get("guid"):
+        keys.append("guid:" + item["guid"])
+    if item.get("link"):
+        keys.append("link:" + normalize_link(item["link"]))
+    return keys
+
+
+def merge_feeds(feeds: Iterable[List[Dict[str, Any]]], count: int, now: float | None = None,
+                previous: List[Dict[str, Any]] | None = None) -> List[Dict[str, Any]]:
+    """Newest-first union of `feeds`; the first feed listed wins for duplicates.
+
+    Items come out stamped by `normalize_items`, so callers can index them as is;
+    `previous` is the last merged list, whose undated items keep their stamps.
+    """
+    now = time.time() if now is None else now
+    seen = set()
+    merged = []
+    for feed in feeds:
+        for item in normalize_items(feed, now, previous):
+            keys = dedupe_keys(item)
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            merged.append(item)
+    merged.sort(key=lambda item: item[TS_KEY], reverse=True)
+    return merged[:count]
@@ -0,0 +1,103 @@
+"""Fetch timings and counters per feed, kept in fixed memory."""
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, Optional
+
+HISTOGRAM_SIZE = 256
+
+# Seconds, measured per request: DNS lookup, connection setup, time to the
+# response headers, body transfer, parsing, waiting for an executor thread
+# (feedparser fallback only) and the whole request.
+TIMINGS = ("dns", "connect", "ttfb", "body", "parse", "executor_wait", "total")
+COUNTERS = ("fetches", "failures", "retries", "not_modified", "unchanged", "cache_hits", "fallback_parses")
+
+
+def _pick(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class RollingHistogram:
+    """The last `size` samples in a ring; percentiles are taken over that window."""
+
+    def __init__(self, size: int = HISTOGRAM_SIZE) -> None:
+        self._samples: deque = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return _pick(sorted(self._samples), pct)
+
+    def summary(self) -> Dict[str, Any]:
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "last": self._samples[-1],
+            "p50": _pick(ordered, 50),
+            "p95": _pick(ordered, 95),
+            "max": ordered[-1],
+        }
+
+
+class FetchTiming:
+    """Scratch record filled in while one request runs; stages that did not happen stay None."""
+
+    __slots__ = ("start", "dns_start", "connect_start", "dns", "connect", "ttfb", "body", "parse",
+                 "executor_wait", "total", "bytes", "items")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.dns_start = self.connect_start = None
+        self.dns = self.connect = self.ttfb = self.body = self.parse = None
+        self.executor_wait = self.total = None
+        self.bytes: Optional[int] = None
+        self.items: Optional[int] = None
+
+
+class FeedMetrics:
+    """Rolling histograms of every `FetchTiming` plus monotonic counters."""
+
+    def __init__(self, size: int = HISTOGRAM_SIZE) -> None:
+        self.timings = {name: RollingHistogram(size) for name in TIMINGS}
+        self.bytes = RollingHistogram(size)
+        self.items = RollingHistogram(size)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._failing = False
+
+    def count(self, name: str) -> None:
+        self.counters[name] += 1
+
+    def fetch_started(self) -> None:
+        self.counters["fetches"] += 1
+        if self._failing:
+            # Attempts after a failure are the retries, whatever schedule made them.
+            self.counters["retries"] += 1
+
+    def fetch_finished(self, timing: FetchTiming, ok: bool) -> None:
+        self._failing = not ok
+        if not ok:
+            self.counters["failures"] += 1
+        if timing.executor_wait is not None:
+            self.counters["fallback_parses"] += 1
+        for name in TIMINGS:
+            value = getattr(timing, name)
+            if value is not None:
+                self.timings[name].add(value)
+        if timing.bytes is not None:
+            self.bytes.add(timing.bytes)
+        if timing.items is not None:
+            self.items.add(timing.items)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "seconds": {name: histogram.summary() for name, histogram in self.timings.items()},
+            "bytes": self.bytes.summary(),
+            "items": self.items.summary(),
+        }
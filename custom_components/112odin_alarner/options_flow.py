@@ -1,48 +1,69 @@
 """Options flow mirroring the config flow with live fetch."""
 from __future__ import annotations
-import asyncio
-import feedparser
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DEFAULT_RSS_URL, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.helpers.network import NoURLAvailableError
+from .const import (
+    DEFAULT_RSS_URL, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT,
+    CONF_SCAN_FLOOR, CONF_SCAN_CEILING, DEFAULT_SCAN_FLOOR, DEFAULT_SCAN_CEILING,
+    CONF_FETCH_MODE, FETCH_MODE_QUERY, FETCH_MODE_LOCAL, CONF_HISTORY_DAYS, CONF_HISTORY_MAX_ROWS,
+    CONF_ENTRY_TYPE, ENTRY_TYPE_AGGREGATE, CONF_INGEST_MODE, INGEST_MODE_POLL, INGEST_MODE_PUSH, CONF_WEBHOOK_ID,
+    CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB, CONF_INCLUDE_CATEGORIES, CONF_EXCLUDE_CATEGORIES, DOMAIN,
+)
+from .coordinator import async_get_feed
+from .extract import StationMap, beredskabs_ids, build_station_map, stations_for
+from .history import DEFAULT_RETENTION_DAYS, DEFAULT_MAX_ROWS
 from typing import Any, Dict, List
 
 class OdinOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry) -> None:
         self.config_entry = config_entry
         self._beredskabs_list: List[str] = []
+        self._station_map: StationMap | None = None
         self._selected_id: str | None = None
 
-    async def _fetch_feed(self) -> Any:
-        session = async_get_clientsession(self.config_entry.hass)
-        timeout = 10
-        async with session.get(DEFAULT_RSS_URL, timeout=timeout) as resp:
-            resp.raise_for_status()
-            raw = await resp.read()
-        loop = asyncio.get_running_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, raw)
-        return feed
+    async def _fetch_feed(self) -> List[Dict[str, Any]]:
+        # Served from the shared TTL cache, so the second step does not refetch.
+        return await async_get_feed(self.hass, DEFAULT_RSS_URL)
+
+    async def _load_station_map(self) -> StationMap:
+        if self._station_map is None:
+            self._station_map = build_station_map(await self._fetch_feed())
+        return self._station_map
+
+    def _ingest_options(self, user_input: Dict[str, Any]) -> Dict[str, Any]:
+        # Keep the webhook id across edits so the relay does not need reconfiguring.
+        mode = user_input.get(CONF_INGEST_MODE, INGEST_MODE_POLL)
+        webhook_id = self.config_entry.options.get(CONF_WEBHOOK_ID)
+        if mode == INGEST_MODE_PUSH and not webhook_id:
+            webhook_id = webhook.async_generate_id()
+            # Shown once to the admin rather than logged: the id is all that protects the endpoint.
+            hass = self.hass
+            try:
+                url = webhook.async_generate_url(hass, webhook_id)
+            except NoURLAvailableError:
+                url = webhook.async_generate_path(webhook_id)
+            persistent_notification.async_create(
+                hass,
+                f"Relays can push alarms for {self.config_entry.title} to {url}. Keep this URL private.",
+                title="112odin webhook",
+                notification_id=f"{DOMAIN}_webhook_{self.config_entry.entry_id}",
+            )
+        options = {CONF_INGEST_MODE: mode}
+        if webhook_id:
+            options[CONF_WEBHOOK_ID] = webhook_id
+        return options
 
     async def async_step_init(self, user_input: Dict[str, Any] | None = None):
+        if self.config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_AGGREGATE:
+            return await self.async_step_aggregate()
         if not self._beredskabs_list:
             try:
-                feed = await self._fetch_feed()
+                mapping = await self._load_station_map()
             except Exception:
                 return self.async_show_form(step_id="init", data_schema=vol.Schema({}), errors={"base": "fetch_error"})
-            ids: List[str] = []
-            for entry in (feed.entries or []):
-                link = entry.get('link', '') or ''
-                if 'beredskabsID=' in link:
-                    try:
-                        val = link.split('beredskabsID=')[1].split('&')[0]
-                        if val and val not in ids:
-                            ids.append(val)
-                    except Exception:
-                        pass
-            if not ids:
-                ids = [""]
-            self._beredskabs_list = ids
+            self._beredskabs_list = beredskabs_ids(mapping) or [""]
 
         if user_input is None:
             default = self.config_entry.options.get(CONF_BEREDSKABSID, self.config_entry.data.get(CONF_BEREDSKABSID, self._beredskabs_list[0] if self._beredskabs_list else ""))
@@ -56,42 +77,83 @@ class OdinOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_station(self, user_input: Dict[str, Any] | None = None):
         try:
-            feed = await self._fetch_feed()
+            mapping = await self._load_station_map()
         except Exception:
             return self.async_show_form(step_id="station", data_schema=vol.Schema({}), errors={"base": "fetch_error"})
 
-        stations: List[str] = []
-        for entry in (feed.entries or []):
-            link = entry.get('link', '') or ''
-            summary = entry.get('summary', '') or ''
-            title = entry.get('title', '') or ''
-            if self._selected_id and self._selected_id not in link and self._selected_id not in summary:
-                continue
-            station = None
-            if 'enhed=' in link:
-                try:
-                    station = link.split('enhed=')[1].split('&')[0]
-                except Exception:
-                    station = None
-            if not station and '-' in title:
-                station = title.split('-')[0].strip()
-            if station and station not in stations:
-                stations.append(station)
-
+        stations = stations_for(mapping, self._selected_id)
         if not stations:
             stations = [""]
 
         if user_input is None:
             default_station = self.config_entry.options.get(CONF_STATION, self.config_entry.data.get(CONF_STATION, stations[0]))
             default_count = self.config_entry.options.get(CONF_COUNT, self.config_entry.data.get(CONF_COUNT, DEFAULT_COUNT))
+            default_floor = self.config_entry.options.get(CONF_SCAN_FLOOR, DEFAULT_SCAN_FLOOR)
+            default_ceiling = self.config_entry.options.get(CONF_SCAN_CEILING, DEFAULT_SCAN_CEILING)
+            default_mode = self.config_entry.options.get(CONF_FETCH_MODE, FETCH_MODE_QUERY)
+            default_days = self.config_entry.options.get(CONF_HISTORY_DAYS, DEFAULT_RETENTION_DAYS)
+            default_rows = self.config_entry.options.get(CONF_HISTORY_MAX_ROWS, DEFAULT_MAX_ROWS)
+            default_ingest = self.config_entry.options.get(CONF_INGEST_MODE, INGEST_MODE_POLL)
+            default_body = self.config_entry.options.get(CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB)
             schema = vol.Schema({
                 vol.Optional(CONF_STATION, default=default_station): vol.In(stations),
-                vol.Optional(CONF_COUNT, default=default_count): vol.All(int, vol.Range(min=1, max=20))
+                vol.Optional(CONF_COUNT, default=default_count): vol.All(int, vol.Range(min=1, max=20)),
+                vol.Optional(CONF_SCAN_FLOOR, default=default_floor): vol.All(int, vol.Range(min=5, max=600)),
+                vol.Optional(CONF_SCAN_CEILING, default=default_ceiling): vol.All(int, vol.Range(min=5, max=3600)),
+                vol.Optional(CONF_FETCH_MODE, default=default_mode): vol.In([FETCH_MODE_QUERY, FETCH_MODE_LOCAL]),
+                vol.Optional(CONF_HISTORY_DAYS, default=default_days): vol.All(int, vol.Range(min=1, max=365)),
+                vol.Optional(CONF_HISTORY_MAX_ROWS, default=default_rows): vol.All(int, vol.Range(min=100, max=100000)),
+                vol.Optional(CONF_INGEST_MODE, default=default_ingest): vol.In([INGEST_MODE_POLL, INGEST_MODE_PUSH]),
+                vol.Optional(CONF_MAX_BODY_KB, default=default_body): vol.All(int, vol.Range(min=64, max=16384)),
+                vol.Optional(CONF_INCLUDE_CATEGORIES, default=self.config_entry.options.get(CONF_INCLUDE_CATEGORIES, "")): str,
+                vol.Optional(CONF_EXCLUDE_CATEGORIES, default=self.config_entry.options.get(CONF_EXCLUDE_CATEGORIES, "")): str
             })
             return self.async_show_form(step_id="station", data_schema=schema)
 
+        floor = int(user_input.get(CONF_SCAN_FLOOR, DEFAULT_SCAN_FLOOR))
+        ceiling = max(floor, int(user_input.get(CONF_SCAN_CEILING, DEFAULT_SCAN_CEILING)))
+
         return self.async_create_entry(title="Options updated", data={
             CONF_STATION: user_input.get(CONF_STATION, ""),
             CONF_COUNT: int(user_input.get(CONF_COUNT, DEFAULT_COUNT)),
-            CONF_BEREDSKABSID: self._selected_id
+            CONF_BEREDSKABSID: self._selected_id,
+            CONF_SCAN_FLOOR: floor,
+            CONF_SCAN_CEILING: ceiling,
+            CONF_FETCH_MODE: user_input.get(CONF_FETCH_MODE, FETCH_MODE_QUERY),
+            CONF_HISTORY_DAYS: int(user_input.get(CONF_HISTORY_DAYS, DEFAULT_RETENTION_DAYS)),
+            CONF_HISTORY_MAX_ROWS: int(user_input.get(CONF_HISTORY_MAX_ROWS, DEFAULT_MAX_ROWS)),
+            CONF_MAX_BODY_KB: int(user_input.get(CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB)),
+            CONF_INCLUDE_CATEGORIES: user_input.get(CONF_INCLUDE_CATEGORIES, ""),
+            CONF_EXCLUDE_CATEGORIES: user_input.get(CONF_EXCLUDE_CATEGORIES, ""),
+            **self._ingest_options(user_input)
+        })
+
+    async def async_step_aggregate(self, user_input: Dict[str, Any] | None = None):
+        # The merged stream has no single beredskabsID/station to pick.
+        if user_input is None:
+            options = self.config_entry.options
+            schema = vol.Schema({
+                vol.Optional(CONF_COUNT, default=options.get(CONF_COUNT, self.config_entry.data.get(CONF_COUNT, DEFAULT_COUNT))): vol.All(int, vol.Range(min=1, max=20)),
+                vol.Optional(CONF_SCAN_FLOOR, default=options.get(CONF_SCAN_FLOOR, DEFAULT_SCAN_FLOOR)): vol.All(int, vol.Range(min=5, max=600)),
+                vol.Optional(CONF_SCAN_CEILING, default=options.get(CONF_SCAN_CEILING, DEFAULT_SCAN_CEILING)): vol.All(int, vol.Range(min=5, max=3600)),
+                vol.Optional(CONF_HISTORY_DAYS, default=options.get(CONF_HISTORY_DAYS, DEFAULT_RETENTION_DAYS)): vol.All(int, vol.Range(min=1, max=365)),
+                vol.Optional(CONF_HISTORY_MAX_ROWS, default=options.get(CONF_HISTORY_MAX_ROWS, DEFAULT_MAX_ROWS)): vol.All(int, vol.Range(min=100, max=100000)),
+                vol.Optional(CONF_INGEST_MODE, default=options.get(CONF_INGEST_MODE, INGEST_MODE_POLL)): vol.In([INGEST_MODE_POLL, INGEST_MODE_PUSH]),
+                vol.Optional(CONF_MAX_BODY_KB, default=options.get(CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB)): vol.All(int, vol.Range(min=64, max=16384)),
+                vol.Optional(CONF_INCLUDE_CATEGORIES, default=options.get(CONF_INCLUDE_CATEGORIES, "")): str,
+                vol.Optional(CONF_EXCLUDE_CATEGORIES, default=options.get(CONF_EXCLUDE_CATEGORIES, "")): str
+            })
+            return self.async_show_form(step_id="aggregate", data_schema=schema)
+
+        floor = int(user_input.get(CONF_SCAN_FLOOR, DEFAULT_SCAN_FLOOR))
+        return self.async_create_entry(title="Options updated", data={
+            CONF_COUNT: int(user_input.get(CONF_COUNT, DEFAULT_COUNT)),
+            CONF_SCAN_FLOOR: floor,
+            CONF_SCAN_CEILING: max(floor, int(user_input.get(CONF_SCAN_CEILING, DEFAULT_SCAN_CEILING))),
+            CONF_HISTORY_DAYS: int(user_input.get(CONF_HISTORY_DAYS, DEFAULT_RETENTION_DAYS)),
+            CONF_HISTORY_MAX_ROWS: int(user_input.get(CONF_HISTORY_MAX_ROWS, DEFAULT_MAX_ROWS)),
+            CONF_MAX_BODY_KB: int(user_input.get(CONF_MAX_BODY_KB, DEFAULT_MAX_BODY_KB)),
+            CONF_INCLUDE_CATEGORIES: user_input.get(CONF_INCLUDE_CATEGORIES, ""),
+            CONF_EXCLUDE_CATEGORIES: user_input.get(CONF_EXCLUDE_CATEGORIES, ""),
+            **self._ingest_options(user_input)
         })
@@ -0,0 +1,133 @@
+"""Dedicated, bounded pool for blocking feed parses, off Home Assistant's shared executor."""
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from .metrics import RollingHistogram
+
+PARSE_WORKERS = 2
+PARSE_QUEUE = 8
+POOL_COUNTERS = ("submitted", "coalesced", "rejected", "completed", "failed")
+
+
+class ParseQueueFullError(Exception):
+    """Raised when `PARSE_QUEUE` jobs are already waiting; the caller keeps its last data."""
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future", "submitted", "started", "finished")
+
+    def __init__(self, fn: Callable, args: tuple, future: asyncio.Future, submitted: float) -> None:
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.submitted = submitted
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+
+class ParsePool:
+    """Run parse jobs on `workers` threads (or processes) of its own.
+
+    At most `max_queue` jobs wait for a worker. A job submitted for a key that
+    is still waiting replaces that job's arguments instead of queueing again:
+    the newer body supersedes the older one and every waiter gets its result.
+    Jobs must be picklable when `processes` is set.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, max_queue: int = PARSE_QUEUE, processes: bool = False) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.processes = processes
+        self._executor: Optional[Executor] = None
+        self._queue: "OrderedDict[Hashable, _Job]" = OrderedDict()
+        self._running = 0
+        self._closed = False
+        self.max_depth = 0
+        self.waits = RollingHistogram()
+        self.runs = RollingHistogram()
+        self.counters = dict.fromkeys(POOL_COUNTERS, 0)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="odin_parse")
+        return self._executor
+
+    async def run(self, key: Hashable, fn: Callable, *args: Any) -> Tuple[Any, float, float]:
+        """Result of `fn(*args)` with the seconds this call waited for a worker and the run took."""
+        loop = asyncio.get_running_loop()
+        if self._closed:
+            raise RuntimeError("Parse pool is shut down")
+        submitted = time.monotonic()
+        self.counters["submitted"] += 1
+        job = self._queue.get(key)
+        if job is not None:
+            job.fn, job.args = fn, args
+            self.counters["coalesced"] += 1
+        else:
+            if len(self._queue) >= self.max_queue:
+                self.counters["rejected"] += 1
+                raise ParseQueueFullError(f"{len(self._queue)} parses already waiting")
+            job = self._queue[key] = _Job(fn, args, loop.create_future(), submitted)
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._dispatch(loop)
+        result = await asyncio.shield(job.future)
+        return result, job.started - submitted, job.finished - job.started
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        while self._queue and self._running < self.workers:
+            _key, job = self._queue.popitem(last=False)
+            self._running += 1
+            job.started = time.monotonic()
+            self.waits.add(job.started - job.submitted)
+            running = loop.run_in_executor(self._get_executor(), job.fn, *job.args)
+            running.add_done_callback(partial(self._done, loop, job))
+
+    def _done(self, loop: asyncio.AbstractEventLoop, job: _Job, running: asyncio.Future) -> None:
+        self._running -= 1
+        job.finished = time.monotonic()
+        self.runs.add(job.finished - job.started)
+        if job.future.done():
+            pass  # Cancelled by shutdown.
+        elif running.cancelled():
+            job.future.cancel()
+        elif running.exception() is not None:
+            self.counters["failed"] += 1
+            job.future.set_exception(running.exception())
+        else:
+            self.counters["completed"] += 1
+            job.future.set_result(running.result())
+        if not self._closed:
+            self._dispatch(loop)
+
+    def shutdown(self) -> None:
+        """Drop waiting jobs and stop the workers without waiting for running parses."""
+        for job in self._queue.values():
+            job.future.cancel()
+        self._queue.clear()
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processes": self.processes,
+            "max_queue": self.max_queue,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "running": self._running,
+            "counters": dict(self.counters),
+            "wait_seconds": self.waits.summary(),
+            "run_seconds": self.runs.summary(),
+        }
@@ -0,0 +1,88 @@
+"""Integration-wide request pacing: a token bucket per host with a priority queue of waiters."""
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Tuple
+
+REQUEST_RATE = 1.0
+REQUEST_BURST = 4
+STAGGER_SPACING = 2.0
+STAGGER_WINDOW = 60.0
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = now
+
+    def take(self, now: float) -> float:
+        """Consume a token and return 0, or return the seconds until one is available."""
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class RequestScheduler:
+    """Hand out requests to each host no faster than its bucket refills.
+
+    Waiters are served lowest `priority` first (ties in arrival order), so a
+    feed that just had activity goes ahead of quiet ones after a restart or an
+    outage. Start offsets spread first refreshes across a window so entries
+    restored from disk do not all poll at the same moment.
+    """
+
+    def __init__(self, rate: float = REQUEST_RATE, burst: float = REQUEST_BURST,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queues: Dict[str, List[Tuple[float, int, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._order = itertools.count()
+        self._starts = itertools.count()
+
+    def waiting(self, host: str) -> int:
+        return sum(1 for _priority, _seq, future in self._queues.get(host, []) if not future.done())
+
+    def start_offset(self) -> float:
+        """Seconds to delay the next caller's first request."""
+        return next(self._starts) * STAGGER_SPACING % STAGGER_WINDOW
+
+    async def acquire(self, host: str, priority: float = 0.0) -> None:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self._rate, self._burst, self._clock())
+        queue = self._queues.setdefault(host, [])
+        if not queue and bucket.take(self._clock()) == 0:
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue, (priority, next(self._order), future))
+        self._drain(host)
+        await future
+
+    def _drain(self, host: str) -> None:
+        timer = self._timers.pop(host, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._queues[host]
+        bucket = self._buckets[host]
+        while queue:
+            if queue[0][2].done():
+                # Cancelled while waiting.
+                heapq.heappop(queue)
+                continue
+            wait = bucket.take(self._clock())
+            if wait:
+                self._timers[host] = asyncio.get_running_loop().call_later(wait, self._drain, host)
+                return
+            heapq.heappop(queue)[2].set_result(None)
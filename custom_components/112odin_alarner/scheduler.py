@@ -0,0 +1,38 @@
+"""Adaptive poll interval: fast right after activity, exponential back-off when quiet."""
+from __future__ import annotations
+import random
+
+BACKOFF_FACTOR = 2.0
+JITTER = 0.1
+
+
+class AdaptiveInterval:
+    """Compute the next poll delay in seconds.
+
+    A new item snaps the interval to `floor`; every quiet poll multiplies it by
+    `factor` up to `ceiling`. Each delay is spread by +/- `jitter` using a
+    generator seeded from `key`, so feeds configured at the same moment drift
+    apart instead of polling in lockstep.
+    """
+
+    def __init__(self, floor: float, ceiling: float, initial: float, key: str,
+                 factor: float = BACKOFF_FACTOR, jitter: float = JITTER) -> None:
+        self._rng = random.Random(key)
+        self._factor = factor
+        self._jitter = jitter
+        self.floor = floor
+        self.ceiling = ceiling
+        self.current = initial
+        self.configure(floor, ceiling)
+
+    def configure(self, floor: float, ceiling: float) -> None:
+        self.floor = max(1.0, float(floor))
+        self.ceiling = max(self.floor, float(ceiling))
+        self.current = min(max(self.current, self.floor), self.ceiling)
+
+    def next(self, activity: bool) -> float:
+        if activity:
+            self.current = self.floor
+        else:
+            self.current = min(self.ceiling, self.current * self._factor)
+        return self.current * self._rng.uniform(1 - self._jitter, 1 + self._jitter)
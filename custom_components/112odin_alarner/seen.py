@@ -0,0 +1,41 @@
+"""Bounded memory of already-announced ODIN items."""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+SEEN_MAX = 500
+
+
+def item_key(item: Dict[str, Any]) -> Optional[str]:
+    """GUID when the feed has one, otherwise the alarm link."""
+    return item.get("guid") or item.get("link") or None
+
+
+class SeenItems:
+    """Insertion-ordered set of item keys that forgets the oldest past `maxlen`."""
+
+    def __init__(self, maxlen: int = SEEN_MAX) -> None:
+        self._maxlen = maxlen
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def update(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remember `items` and return the ones that were not seen before, in feed order."""
+        new = []
+        for item in items:
+            key = item_key(item)
+            if key is None:
+                continue
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                continue
+            self._keys[key] = None
+            new.append(item)
+        while len(self._keys) > self._maxlen:
+            self._keys.popitem(last=False)
+        return new
@@ -1,42 +1,152 @@
-"""Sensor platform using aiohttp via HA client session and feedparser."""
+"""Sensor platform fed by the shared per-URL ODIN feed coordinator."""
 from __future__ import annotations
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import HomeAssistantType
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_NAME
-import asyncio
-import logging
-import feedparser
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN, CONF_BEREDSKABSID, CONF_STATION, CONF_COUNT, DEFAULT_COUNT, DEFAULT_NAME, EVENT_NEW_ALARM,
+    DATA_STATS, SIGNAL_STATS_UPDATED, SIGNAL_LATEST_UPDATED, STORAGE_VERSION,
+)
+from .attributes import build_attributes
+from .coordinator import OdinFeedCoordinator, Subscription
+from .extract import item_ids
+from .metrics import FeedMetrics
+from .seen import SeenItems
+from .stats import WINDOWS, EntryStats
+from .timestamps import TS_KEY, item_epoch
 
-_LOGGER = logging.getLogger(__name__)
+# Entities never fetch: requests are paced by the coordinators and the shared
+# request scheduler, so entity updates need no extra serialisation.
+PARALLEL_UPDATES = 0
 
-MAX_RETRIES = 3
-TIMEOUT = 10
+# Only the rate sensors poll; they re-read their ring counters so windows decay
+# while no alarms arrive.
+SCAN_INTERVAL = timedelta(seconds=60)
+STATS_SAVE_DELAY = 30
+
+def _p95_ms(name: str):
+    def value(metrics: FeedMetrics) -> Optional[float]:
+        p95 = metrics.timings[name].percentile(95)
+        return None if p95 is None else round(p95 * 1000, 1)
+    return value
+
+# (key, name, device class, unit, state class, value) for the diagnostic sensors.
+METRIC_SENSORS = (
+    ("fetch_time", "fetch time p95", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _p95_ms("total")),
+    ("ttfb", "time to first byte p95", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _p95_ms("ttfb")),
+    ("parse_time", "parse time p95", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _p95_ms("parse")),
+    ("executor_wait", "executor wait p95", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _p95_ms("executor_wait")),
+    ("response_size", "response size p95", SensorDeviceClass.DATA_SIZE, UnitOfInformation.BYTES,
+     SensorStateClass.MEASUREMENT, lambda metrics: metrics.bytes.percentile(95)),
+    ("retries", "retries", None, None, SensorStateClass.TOTAL_INCREASING,
+     lambda metrics: metrics.counters["retries"]),
+    ("cache_hits", "cache hits", None, None, SensorStateClass.TOTAL_INCREASING,
+     lambda metrics: metrics.counters["cache_hits"]),
+)
+
+def stats_store(hass, entry_id: str) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.stats.{entry_id}")
 
 async def async_setup_entry(hass: HomeAssistantType, entry, async_add_entities):
-    data = entry.data
-    rss_url = data.get("rss_url")
-    beredskabsID = data.get(CONF_BEREDSKABSID)
-    station = entry.options.get(CONF_STATION, data.get(CONF_STATION, ""))
-    count = int(entry.options.get(CONF_COUNT, data.get(CONF_COUNT, 5)))
-
-    sensor = OdinFeedSensor(hass, entry.entry_id, rss_url, beredskabsID, station, count)
-    async_add_entities([sensor], update_before_add=True)
-
-class OdinFeedSensor(SensorEntity):
-    def __init__(self, hass, entry_id: str, rss_url: str, beredskabsID: str, station: str, count: int):
-        self.hass = hass
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    beredskabsID = entry.options.get(CONF_BEREDSKABSID, entry.data.get(CONF_BEREDSKABSID))
+    station = entry.options.get(CONF_STATION, entry.data.get(CONF_STATION, ""))
+    count = int(entry.options.get(CONF_COUNT, entry.data.get(CONF_COUNT, DEFAULT_COUNT)))
+
+    # Kept across reloads so an options change does not lose unsaved counts.
+    all_stats = hass.data[DOMAIN].setdefault(DATA_STATS, {})
+    stats = all_stats.get(entry.entry_id)
+    if stats is None:
+        stats = all_stats[entry.entry_id] = EntryStats()
+        stored = await stats_store(hass, entry.entry_id).async_load()
+        if stored:
+            stats.restore(stored)
+    known_stations = list(stats.stations)
+    tracker = _StatsTracker(hass, entry.entry_id, station, stats, async_add_entities)
+
+    # Stations first seen in the backlog are added by the tracker itself.
+    sensor = OdinFeedSensor(coordinator, entry.entry_id, beredskabsID, station, count, tracker,
+                            coordinator.subscription_for(entry.entry_id))
+    entities: List[SensorEntity] = [sensor, OdinLatestAlarmSensor(entry.entry_id, sensor)]
+    entities += [OdinRateSensor(entry.entry_id, stats, window) for window in WINDOWS]
+    entities += [OdinRateSensor(entry.entry_id, stats, window, name) for name in known_stations for window in WINDOWS]
+    entities += [OdinMetricSensor(coordinator, entry.entry_id, *description) for description in METRIC_SENSORS]
+    async_add_entities(entities)
+
+class _StatsTracker:
+    """Feeds new items into the entry's ring counters and adds per-station rate sensors."""
+
+    def __init__(self, hass, entry_id: str, station: str, stats: EntryStats, async_add_entities) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self._station = station
+        self._stats = stats
+        self._store = stats_store(hass, entry_id)
+        self._async_add_entities = async_add_entities
+
+    def _station_of(self, item: Dict[str, Any]) -> Optional[str]:
+        # An entry bound to one station has nothing to split per station.
+        return None if self._station else item_ids(item)[1]
+
+    @callback
+    def record(self, items: List[Dict[str, Any]], backlog: bool = False) -> None:
+        if backlog and self._stats.restored:
+            return
+        self._stats.restored = True
+        now = time.time()
+        added = self._stats.record(items, now, lambda item: min(now, item_epoch(item, now)),
+                                   self._station_of)
+        self._store.async_delay_save(self._stats.as_dict, STATS_SAVE_DELAY)
+        if added:
+            self._async_add_entities([
+                OdinRateSensor(self._entry_id, self._stats, window, name) for name in added for window in WINDOWS
+            ])
+        async_dispatcher_send(self._hass, SIGNAL_STATS_UPDATED.format(self._entry_id))
+
+class OdinFeedSensor(CoordinatorEntity, SensorEntity):
+    """Alarm count with a compact summary of the latest alarm.
+
+    The full item list stays available as the `entries` attribute for templates
+    but is kept out of the recorder; the recorded attributes only change when
+    the feed content does.
+    """
+
+    _unrecorded_attributes = frozenset({"entries"})
+
+    def __init__(self, coordinator: OdinFeedCoordinator, entry_id: str, beredskabsID: str, station: str, count: int,
+                 tracker: _StatsTracker | None = None, subscription: Subscription | None = None):
+        super().__init__(coordinator)
+        # Category filters run here so dropped items never reach state, events or stats.
+        self._classifier = subscription.classifier if subscription is not None and subscription.filtered else None
+        self._tracker = tracker
         self._entry_id = entry_id
-        self._rss_url = rss_url.rstrip('/')
         self._beredskabsID = beredskabsID
         self._station = station
+        self._rss_url = coordinator.rss_url
         self._count = max(1, min(20, int(count)))
         self._attr_name = DEFAULT_NAME
         self._state: Optional[int] = None
         self._entries: List[Dict[str, Any]] = []
+        self._attributes: Dict[str, Any] = {"entries": [], "rss_url": self._rss_url}
+        self._source: Optional[List[Dict[str, Any]]] = None
+        # What the first state write will show, so the first unchanged poll does not write again.
+        self._was_available = self.available
+        self._seen = SeenItems()
+        backlog = self._update_from_coordinator()
+        if tracker is not None and backlog:
+            tracker.record(backlog, backlog=True)
 
     @property
     def unique_id(self) -> str:
@@ -48,62 +158,133 @@ class OdinFeedSensor(SensorEntity):
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        return {
-            "entries": self._entries,
-            "last_update": datetime.utcnow().isoformat() + "Z",
-            "rss_url": self._rss_url
-        }
-
-    async def _fetch(self, session, url: str) -> Optional[bytes]:
-        last_exc = None
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                import aiohttp
-                timeout = aiohttp.ClientTimeout(total=TIMEOUT)
-                async with session.get(url, timeout=timeout) as resp:
-                    if resp.status != 200:
-                        raise Exception(f"HTTP {resp.status}")
-                    return await resp.read()
-            except Exception as e:
-                last_exc = e
-                _LOGGER.warning("Fetch attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
-                await asyncio.sleep(2 ** attempt)
-        _LOGGER.error("All fetch attempts failed: %s", last_exc)
-        return None
-
-    async def async_update(self) -> None:
-        params = []
-        if self._beredskabsID:
-            params.append(f"beredskabsID={self._beredskabsID}")
-        if self._station:
-            params.append(f"enhed={self._station}")
-        if self._count:
-            params.append(f"antal={self._count}")
-        url = f"{self._rss_url}?" + "&".join(params)
-
-        try:
-            session = async_get_clientsession(self.hass)
-        except Exception:
-            raise ConfigEntryNotReady
-
-        raw = await self._fetch(session, url)
-        if raw is None:
+        return self._attributes
+
+    def _update_from_coordinator(self) -> List[Dict[str, Any]]:
+        """Refresh the cached slice and return the items this entry has not seen yet."""
+        self._source = self.coordinator.data
+        if self.coordinator.data is None:
             self._state = None
             self._entries = []
-            return
+            return []
+        if self._classifier is None:
+            entries = self.coordinator.items_for(self._beredskabsID, self._station, self._count)
+        else:
+            candidates = self.coordinator.items_for(self._beredskabsID, self._station, self.coordinator.count)
+            entries = self._classifier.apply(candidates)[:self._count]
+        if entries != self._entries or "last_update" not in self._attributes:
+            self._entries = entries
+            self._attributes = self._build_attributes(entries)
+        self._state = len(entries)
+        return self._seen.update(entries)
 
-        loop = asyncio.get_running_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, raw)
-        if getattr(feed, 'bozo', False):
-            _LOGGER.warning("Feed parsed with warnings: %s", getattr(feed, 'bozo_exception', 'unknown'))
-        items = []
-        for it in (feed.entries or [])[: self._count]:
-            items.append({
-                "title": it.get("title"),
-                "description": it.get("description") or it.get('summary'),
-                "summary": it.get('summary'),
-                "published": it.get("published", it.get("updated", "")),
-                "link": it.get("link")
+    @property
+    def latest_time(self) -> Optional[datetime]:
+        if not self._entries or self._entries[0].get(TS_KEY) is None:
+            return None
+        return dt_util.utc_from_timestamp(self._entries[0][TS_KEY])
+
+    def _build_attributes(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return build_attributes(entries, self._rss_url, dt_util.utcnow().isoformat())
+
+    def _fire_new_alarms(self, items: List[Dict[str, Any]]) -> None:
+        # Oldest first, so automations see alarms in the order they were raised.
+        for item in reversed(items):
+            self.hass.bus.async_fire(EVENT_NEW_ALARM, {
+                "entry_id": self._entry_id,
+                "entity_id": self.entity_id,
+                "beredskabsID": self._beredskabsID,
+                "station": self._station,
+                **item,
             })
-        self._entries = items
-        self._state = len(items)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # The coordinator hands back the same list object when the feed is unchanged.
+        available = self.available
+        if self.coordinator.data is self._source and available == self._was_available:
+            return
+        self._was_available = available
+        # Items present on the first fill are the backlog, not new alarms.
+        seeded = self._source is not None
+        new_items = self._update_from_coordinator()
+        if seeded and new_items:
+            self._fire_new_alarms(new_items)
+        if self._tracker is not None and new_items:
+            self._tracker.record(new_items, backlog=not seeded)
+        super()._handle_coordinator_update()
+        async_dispatcher_send(self.hass, SIGNAL_LATEST_UPDATED.format(self._entry_id))
+
+class OdinLatestAlarmSensor(SensorEntity):
+    """When the entry's newest alarm was published, as a timestamp sensor."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+
+    def __init__(self, entry_id: str, feed: OdinFeedSensor) -> None:
+        self._entry_id = entry_id
+        self._feed = feed
+        self._attr_name = f"{DEFAULT_NAME} latest alarm"
+        self._attr_unique_id = f"112odin_{entry_id}_latest"
+
+    @property
+    def native_value(self) -> Optional[datetime]:
+        return self._feed.latest_time
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, SIGNAL_LATEST_UPDATED.format(self._entry_id), self.async_write_ha_state
+        ))
+
+class OdinRateSensor(SensorEntity):
+    """Alarms in a sliding window, for the whole entry or one station."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "alarms"
+
+    def __init__(self, entry_id: str, stats: EntryStats, window: str, station: str | None = None) -> None:
+        self._entry_id = entry_id
+        self._stats = stats
+        self._window = window
+        self._station = station
+        if station:
+            self._attr_name = f"{DEFAULT_NAME} {station} alarms {window}"
+            self._attr_unique_id = f"112odin_{entry_id}_{station}_rate_{window}"
+        else:
+            self._attr_name = f"{DEFAULT_NAME} alarms {window}"
+            self._attr_unique_id = f"112odin_{entry_id}_rate_{window}"
+
+    @property
+    def native_value(self) -> int:
+        rates = self._stats.stations.get(self._station) if self._station else self._stats.overall
+        return rates.total(self._window, time.time()) if rates is not None else 0
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, SIGNAL_STATS_UPDATED.format(self._entry_id), self.async_write_ha_state
+        ))
+
+class OdinMetricSensor(CoordinatorEntity, SensorEntity):
+    """One fetch metric of the entry's coordinator; disabled until someone needs it."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: OdinFeedCoordinator, entry_id: str, key: str, name: str,
+                 device_class, unit, state_class, value) -> None:
+        super().__init__(coordinator)
+        self._value = value
+        self._attr_name = f"{DEFAULT_NAME} {name}"
+        self._attr_unique_id = f"112odin_{entry_id}_metric_{key}"
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def available(self) -> bool:
+        # Metrics stay meaningful while fetches fail; that is when they matter most.
+        return True
+
+    @property
+    def native_value(self):
+        return self._value(self.coordinator.metrics)
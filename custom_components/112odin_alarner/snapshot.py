@@ -0,0 +1,64 @@
+"""Last-known-good feed items persisted with HA's Store helper."""
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List, Optional
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from .const import DOMAIN, DATA_SNAPSHOTS, STORAGE_VERSION
+
+SAVE_DELAY = 30
+
+# Stored field -> item key. "summary" is not stored: it always equals "description".
+_FIELDS = {"t": "title", "d": "description", "p": "published", "l": "link", "g": "guid"}
+
+
+def compact(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{short: item[key] for short, key in _FIELDS.items() if item.get(key)} for item in items]
+
+
+def expand(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    items = []
+    for record in records:
+        item = {key: record.get(short) for short, key in _FIELDS.items()}
+        item["published"] = item["published"] or ""
+        item["summary"] = item["description"]
+        items.append(item)
+    return items
+
+
+class SnapshotStore:
+    """One storage file holding the latest items of every coordinator, keyed by feed key."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.snapshots")
+        self._data: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        records = self._data.get(key)
+        return expand(records) if records else None
+
+    def async_save(self, key: str, items: List[Dict[str, Any]]) -> None:
+        self._data[key] = compact(items)
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    def async_remove(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> SnapshotStore:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    pending = domain_data.get(DATA_SNAPSHOTS)
+    if pending is None:
+        # Entries set up concurrently all wait for the same single load.
+        store = SnapshotStore(hass)
+        pending = domain_data[DATA_SNAPSHOTS] = asyncio.ensure_future(_async_load(store))
+    return await asyncio.shield(pending)
+
+
+async def _async_load(store: SnapshotStore) -> SnapshotStore:
+    await store.async_load()
+    return store
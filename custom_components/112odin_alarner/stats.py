@@ -0,0 +1,127 @@
+"""Sliding-window alarm counters kept in fixed-size rings of time buckets."""
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# window name -> (span in seconds, number of buckets)
+WINDOWS = {
+    "1h": (3600, 60),
+    "24h": (86400, 96),
+    "7d": (604800, 168),
+}
+
+
+class RingCounter:
+    """Count events over the last `span` seconds with `buckets` slots of resolution.
+
+    Adding and reading cost O(1) plus one slot clear per bucket boundary
+    crossed since the previous call, never a scan of past events.
+    """
+
+    def __init__(self, span: float, buckets: int) -> None:
+        self._width = span / buckets
+        self._counts = [0] * buckets
+        self._head: Optional[int] = None
+        self._total = 0
+
+    def _advance(self, bucket: int) -> None:
+        if self._head is None:
+            self._head = bucket
+            return
+        steps = bucket - self._head
+        if steps <= 0:
+            return
+        size = len(self._counts)
+        if steps >= size:
+            self._counts = [0] * size
+            self._total = 0
+        else:
+            for step in range(1, steps + 1):
+                slot = (self._head + step) % size
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+        self._head = bucket
+
+    def add(self, ts: float, now: float) -> None:
+        current = int(now // self._width)
+        self._advance(current)
+        bucket = min(int(ts // self._width), current)
+        if current - bucket >= len(self._counts):
+            return
+        self._counts[bucket % len(self._counts)] += 1
+        self._total += 1
+
+    def total(self, now: float) -> int:
+        self._advance(int(now // self._width))
+        return self._total
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"head": self._head, "counts": list(self._counts)}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        counts = data.get("counts") or []
+        if len(counts) == len(self._counts):
+            self._counts = list(counts)
+            self._head = data.get("head")
+            self._total = sum(counts)
+
+
+class AlarmRates:
+    """One ring counter per window in `WINDOWS`."""
+
+    def __init__(self) -> None:
+        self.windows = {name: RingCounter(span, buckets) for name, (span, buckets) in WINDOWS.items()}
+
+    def add(self, ts: float, now: float) -> None:
+        for counter in self.windows.values():
+            counter.add(ts, now)
+
+    def total(self, window: str, now: float) -> int:
+        return self.windows[window].total(now)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: counter.as_dict() for name, counter in self.windows.items()}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        for name, counter in self.windows.items():
+            if name in data:
+                counter.restore(data[name])
+
+
+class EntryStats:
+    """Rates for a config entry as a whole and for each station seen in its items."""
+
+    def __init__(self) -> None:
+        self.overall = AlarmRates()
+        self.stations: Dict[str, AlarmRates] = {}
+        self.restored = False
+
+    def record(self, items: Iterable[Dict[str, Any]], now: float,
+               timestamp: Callable[[Dict[str, Any]], float],
+               station: Callable[[Dict[str, Any]], Optional[str]]) -> List[str]:
+        """Count `items`; return stations that were seen for the first time."""
+        added = []
+        for item in items:
+            ts = timestamp(item)
+            self.overall.add(ts, now)
+            name = station(item)
+            if not name:
+                continue
+            rates = self.stations.get(name)
+            if rates is None:
+                rates = self.stations[name] = AlarmRates()
+                added.append(name)
+            rates.add(ts, now)
+        return added
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "overall": self.overall.as_dict(),
+            "stations": {name: rates.as_dict() for name, rates in self.stations.items()},
+        }
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        self.overall.restore(data.get("overall") or {})
+        for name, rates_data in (data.get("stations") or {}).items():
+            rates = self.stations[name] = AlarmRates()
+            rates.restore(rates_data)
+        self.restored = True
@@ -0,0 +1,40 @@
+"""Item publication times as epoch seconds, parsed once and cached."""
+from __future__ import annotations
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Epoch seconds of "published", stamped once when items enter the integration.
+TS_KEY = "published_ts"
+# Feeds repeat the same pubDate strings poll after poll.
+PARSE_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_epoch(value: str) -> Optional[float]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        # RFC 822 "-0000" means UTC with no further information.
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_published(value: str | None) -> Optional[float]:
+    """Epoch seconds of an RFC 822 date, or None when it is missing or unparsable."""
+    return _parse_epoch(value) if value else None
+
+
+def published_epoch(value: str | None, default: float) -> float:
+    """Epoch seconds of an RFC 822 date, or `default` when it is missing or unparsable."""
+    epoch = parse_published(value)
+    return default if epoch is None else epoch
+
+
+def item_epoch(item: Dict[str, Any], default: float) -> float:
+    """The item's stamped `published_ts`, parsing "published" only for items that never got one."""
+    ts = item.get(TS_KEY)
+    return published_epoch(item.get("published"), default) if ts is None else ts
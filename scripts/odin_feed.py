@@ -0,0 +1,18 @@
+"""Run the integration's feed CLI (custom_components/112odin_alarner/cli.py) outside Home Assistant.
+
+Only the HA-independent modules are loaded, so this needs aiohttp (and
+feedparser for malformed feeds) but not Home Assistant itself.
+"""
+import pathlib
+import sys
+import types
+
+PACKAGE_DIR = pathlib.Path(__file__).resolve().parent.parent / "custom_components" / "112odin_alarner"
+
+if __name__ == "__main__":
+    # Same namespace trick as tests/conftest.py: the integration's __init__ needs HA.
+    package = types.ModuleType("odin_alarner")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["odin_alarner"] = package
+    from odin_alarner.cli import main
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Benchmarks of the per-poll hot paths on synthetic feeds of 10 to 10,000 items.
+
+They are skipped in ordinary test runs. Record a baseline for this machine with
+
+    pytest tests/benchmarks --benchmark-only --benchmark-storage=tests/benchmarks/baselines \
+        --benchmark-warmup=on --benchmark-min-rounds=20 --benchmark-save=baseline
+
+and fail on regressions against the latest saved baseline with
+
+    pytest tests/benchmarks --benchmark-only --benchmark-storage=tests/benchmarks/baselines \
+        --benchmark-warmup=on --benchmark-compare --benchmark-compare-fail=median:50%
+
+which is what the Benchmarks workflow (.github/workflows/benchmarks.yml) runs on
+every push. Baselines are stored per interpreter and record from a clean tree
+(`commit_info.dirty` false); re-record after changing or adding benchmarks, or
+the new ones are never compared. The median is compared rather than the minimum,
+which a single noisy round can move by more than the threshold.
+"""
+import pathlib
+
+import pytest
+
+from synthetic import render_rss, synthetic_items
+
+SIZES = [10, 100, 1000, 10000]
+
+_HERE = pathlib.Path(__file__).resolve().parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark-only")
+    for item in items:
+        if _HERE in pathlib.Path(item.fspath).resolve().parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}items")
+def feed_size(request):
+    return request.param
+
+
+@pytest.fixture
+def synthetic_feed(feed_size):
+    return render_rss(synthetic_items(feed_size))
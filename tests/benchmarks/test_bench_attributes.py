@@ -0,0 +1,24 @@
+import pytest
+
+from synthetic import synthetic_items
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="attributes")
+def test_bench_sensor_attributes(benchmark, load_odin_module, feed_size):
+    # One sensor update: parsed items to dicts, the index lookup, then the attribute dict.
+    parser = load_odin_module("parser")
+    index_module = load_odin_module("index")
+    attributes = load_odin_module("attributes")
+    parsed = [parser.OdinItem(item["title"], item["description"], item["published"], item["link"], item["guid"])
+              for item in synthetic_items(feed_size)]
+
+    def update():
+        items = [item.as_dict() for item in parsed]
+        entries = index_module.FeedIndex(items).lookup(None, None, 20)
+        return attributes.build_attributes(entries, "http://www.odin.dk/RSS/RSS.aspx", "2026-10-18T00:00:00+00:00")
+
+    result = benchmark(update)
+    assert len(result["entries"]) == min(20, feed_size)
+    assert "summary" not in result["entries"][0]
@@ -0,0 +1,30 @@
+import pytest
+
+from synthetic import synthetic_items
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def items(feed_size):
+    return synthetic_items(feed_size)
+
+
+@pytest.mark.benchmark(group="station-map")
+def test_bench_station_map(benchmark, load_odin_module, items):
+    # What the config and options flows build from the live feed.
+    extract = load_odin_module("extract")
+
+    def build():
+        mapping = extract.build_station_map(items)
+        return [extract.stations_for(mapping, beredskabsID) for beredskabsID in extract.beredskabs_ids(mapping)]
+
+    stations = benchmark(build)
+    assert stations and all(stations)
+
+
+@pytest.mark.benchmark(group="index")
+def test_bench_feed_index(benchmark, load_odin_module, items):
+    index = benchmark(load_odin_module("index").FeedIndex, items)
+    first = items[0]
+    assert index.lookup(first["beredskabsID"], first["station"], 5)[0] is first
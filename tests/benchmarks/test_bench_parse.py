@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+feedparser = pytest.importorskip("feedparser")
+
+
+@pytest.mark.benchmark(group="parse")
+def test_bench_feedparser(benchmark, synthetic_feed, feed_size):
+    feed = benchmark(feedparser.parse, synthetic_feed)
+    assert len(feed.entries) == feed_size
+
+
+@pytest.mark.benchmark(group="parse")
+def test_bench_stream_parser(benchmark, load_odin_module, synthetic_feed, feed_size):
+    parser = load_odin_module("parser")
+    items = benchmark(lambda: [item.as_dict() for item in parser.parse_bytes(synthetic_feed, None)])
+    assert len(items) == feed_size
+
+
+@pytest.mark.benchmark(group="parse-first-5")
+def test_bench_stream_parser_early_stop(benchmark, load_odin_module, synthetic_feed):
+    # What a sensor with the default count actually pays per poll.
+    parser = load_odin_module("parser")
+    assert len(benchmark(parser.parse_bytes, synthetic_feed, 5)) == 5
+
+
+@pytest.mark.benchmark(group="parse-odin-fixture")
+def test_bench_feedparser_odin_fixture(benchmark, odin_payload):
+    assert len(benchmark(feedparser.parse, odin_payload).entries) == 25
+
+
+@pytest.mark.benchmark(group="parse-odin-fixture")
+def test_bench_stream_parser_odin_fixture(benchmark, load_odin_module, odin_payload):
+    # Same work as feedparser: the whole recorded feed, turned into item dicts.
+    parser = load_odin_module("parser")
+    assert len(benchmark(lambda: [item.as_dict() for item in parser.parse_bytes(odin_payload, None)])) == 25
@@ -0,0 +1,31 @@
+import importlib
+import pathlib
+import sys
+import types
+import pytest
+
+PACKAGE_DIR = pathlib.Path(__file__).resolve().parent.parent / "custom_components" / "112odin_alarner"
+FIXTURES_DIR = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+# Expose the integration's modules under a bare namespace package so the
+# HA-independent ones (and their relative imports) load without running the
+# integration's __init__, which needs Home Assistant.
+_NAMESPACE = "odin_alarner"
+if _NAMESPACE not in sys.modules:
+    _package = types.ModuleType(_NAMESPACE)
+    _package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules[_NAMESPACE] = _package
+
+
+def _load(name):
+    return importlib.import_module(f"{_NAMESPACE}.{name}")
+
+
+@pytest.fixture
+def load_odin_module():
+    return _load
+
+
+@pytest.fixture
+def odin_payload():
+    return (FIXTURES_DIR / "odin_rss.xml").read_bytes()
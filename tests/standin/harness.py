@@ -0,0 +1,274 @@
+"""Async load harness: many simulated config entries polling an ODIN stand-in.
+
+Entries with the same query share one poller, exactly like the integration's
+shared coordinator, and each poll runs the coordinator's and sensor's code
+path: the integration's guarded request (breaker, per-host request scheduler
+and concurrency limit, conditional GET, stream parse with feedparser on the
+parse pool for malformed XML), body hashing, normalize and index, per-entry
+slice, attribute build, seen-set update and a history write in the executor.
+Failed polls back off the way the coordinator does.
+
+    python tests/standin/harness.py --entries 300 --duration 60 --error-rate 0.05 --latency 0.2
+
+starts its own stand-in unless ``--url`` is given and prints a JSON report
+with p50/p99 update latency, event-loop lag, executor queue depth and the
+parse pool's depth and wait times. The integration's scheduler allows one
+request per second per host, so with many pollers that dominates the update
+latency; ``--rate`` raises it to load the client side alone.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import hashlib
+import json
+import pathlib
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+from xml.etree.ElementTree import ParseError
+
+import aiohttp
+from aiohttp import web
+
+TESTS_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TESTS_DIR))
+if "odin_alarner" not in sys.modules:
+    # Same namespace trick as tests/conftest.py: load the HA-independent modules only.
+    _package = types.ModuleType("odin_alarner")
+    _package.__path__ = [str(TESTS_DIR.parent / "custom_components" / "112odin_alarner")]
+    sys.modules["odin_alarner"] = _package
+
+from odin_alarner.attributes import build_attributes  # noqa: E402
+from odin_alarner.extract import item_ids  # noqa: E402
+from odin_alarner.breaker import CircuitBreaker, CircuitOpenError  # noqa: E402
+from odin_alarner.client import LOCAL_ERRORS, async_guarded_request  # noqa: E402
+from odin_alarner.const import HOST_CONCURRENCY  # noqa: E402
+from odin_alarner.history import AlarmHistory, records_from_items  # noqa: E402
+from odin_alarner.index import FeedIndex, normalize_items  # noqa: E402
+from odin_alarner.metrics import FeedMetrics  # noqa: E402
+from odin_alarner.parser import MAX_BODY_BYTES, BodyTooLargeError  # noqa: E402
+from odin_alarner.parsepool import ParsePool, ParseQueueFullError  # noqa: E402
+from odin_alarner.ratelimit import REQUEST_RATE, RequestScheduler  # noqa: E402
+from odin_alarner.scheduler import AdaptiveInterval  # noqa: E402
+from odin_alarner.seen import SeenItems  # noqa: E402
+from synthetic import BEREDSKABS_IDS, synthetic_items  # noqa: E402
+from standin.server import FEED_PATH, OdinStandin, add_fault_arguments, build_app, faults_from_args  # noqa: E402
+
+SAMPLE_EVERY = 0.05
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class _Entry:
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.seen = SeenItems()
+        self.attributes: Dict[str, Any] = {}
+
+
+class LoadReport:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.parse_fallbacks = 0
+        self.new_alarms = 0
+        self.loop_lag: List[float] = []
+        self.executor_depth: List[int] = []
+
+    def as_dict(self, entries: int, pollers: int, duration: float) -> Dict[str, Any]:
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "entries": entries,
+            "pollers": pollers,
+            "duration_s": duration,
+            "updates": len(self.latencies),
+            "errors": self.errors,
+            "parse_fallbacks": self.parse_fallbacks,
+            "new_alarms": self.new_alarms,
+            "update_latency_ms": {"p50": ms(percentile(self.latencies, 50)), "p99": ms(percentile(self.latencies, 99))},
+            "loop_lag_ms": {"p50": ms(percentile(self.loop_lag, 50)), "p99": ms(percentile(self.loop_lag, 99)),
+                            "max": ms(max(self.loop_lag, default=None))},
+            "executor_queue_depth": {"max": max(self.executor_depth, default=0),
+                                     "mean": round(sum(self.executor_depth) / len(self.executor_depth), 2)
+                                     if self.executor_depth else 0},
+        }
+
+
+class _Shared:
+    """What the integration keeps in `hass.data`: one scheduler, a breaker per endpoint, a limit per host."""
+
+    def __init__(self, session: aiohttp.ClientSession, pool: ParsePool, rate: float, max_bytes: int) -> None:
+        self.session = session
+        self.pool = pool
+        self.scheduler = RequestScheduler(rate)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.limits: Dict[str, asyncio.Semaphore] = {}
+        self.metrics = FeedMetrics()
+        self.max_bytes = max_bytes
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        return self.breakers.setdefault(url.split('?', 1)[0].rstrip('/'), CircuitBreaker())
+
+    def limit(self, url: str) -> asyncio.Semaphore:
+        return self.limits.setdefault(urlsplit(url).netloc.lower(), asyncio.Semaphore(HOST_CONCURRENCY))
+
+
+async def _poll(url: str, entries: List[_Entry], history: AlarmHistory, report: LoadReport, shared: _Shared,
+                floor: float, ceiling: float, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    count = max(entry.count for entry in entries)
+    interval = AdaptiveInterval(floor, ceiling, floor, url)
+    headers: Dict[str, str] = {}
+    body_hash = None
+    data: Optional[List[Dict[str, Any]]] = None
+    while not stop.is_set():
+        started = loop.time()
+        activity = False
+        delay = None
+        try:
+            response = await async_guarded_request(
+                shared.session, url, count, shared.breaker(url), shared.scheduler, shared.limit(url),
+                shared.metrics, shared.max_bytes, headers, shared.pool, interval.current)
+            if response.items is not None:
+                headers = {name: value for name, value in (("If-None-Match", response.etag),
+                           ("If-Modified-Since", response.last_modified)) if value}
+                digest = hashlib.blake2b(response.consumed, digest_size=16).digest()
+                if digest != body_hash or data is None:
+                    body_hash = digest
+                    data = normalize_items(response.items, previous=data)
+                    # Rebuilt on every changed body, as the coordinator does.
+                    FeedIndex(data)
+                    for entry in entries:
+                        sliced = data[:entry.count]
+                        entry.attributes = build_attributes(sliced, url, time.strftime("%Y-%m-%dT%H:%M:%S"))
+                        new = entry.seen.update(sliced)
+                        report.new_alarms += len(new)
+                        activity = activity or bool(new)
+                    loop.run_in_executor(None, history.add, records_from_items(data, item_ids))
+            report.latencies.append(loop.time() - started)
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError, BodyTooLargeError, ParseError,
+                ParseQueueFullError) as err:
+            # Counted like the integration's failed polls; one poller must not end the run.
+            report.errors += 1
+            if not isinstance(err, LOCAL_ERRORS):
+                delay = shared.breaker(url).retry_in()
+        try:
+            await asyncio.wait_for(stop.wait(), interval.next(activity) if delay is None else delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _monitor(executor: ThreadPoolExecutor, report: LoadReport, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + SAMPLE_EVERY
+        await asyncio.sleep(SAMPLE_EVERY)
+        report.loop_lag.append(max(0.0, loop.time() - expected))
+        report.executor_depth.append(executor._work_queue.qsize())
+
+
+def entry_queries(entries: int, shared: bool = True) -> List[Dict[str, str]]:
+    """Spread entries over the stand-in's IDs and stations like real installs.
+
+    With `shared` False every entry gets its own query, as before the shared coordinator.
+    """
+    stations = {}
+    for item in synthetic_items(len(BEREDSKABS_IDS) * 3):
+        stations.setdefault(item["beredskabsID"], []).append(item["station"])
+    queries = []
+    for n in range(entries):
+        beredskabsID = BEREDSKABS_IDS[n % len(BEREDSKABS_IDS)]
+        query = {"beredskabsID": beredskabsID}
+        choices = stations[beredskabsID]
+        if n // len(BEREDSKABS_IDS) % (len(choices) + 1):
+            query["enhed"] = choices[n // len(BEREDSKABS_IDS) % (len(choices) + 1) - 1]
+        if not shared:
+            query["entry"] = str(n)
+        queries.append(query)
+    return queries
+
+
+async def run_load(url: str, entries: int, duration: float, count: int = 5, floor: float = 1.0,
+                   ceiling: float = 8.0, shared: bool = True, workers: int = 4,
+                   max_bytes: int = MAX_BODY_BYTES, rate: float = REQUEST_RATE) -> Dict[str, Any]:
+    """Poll `url` for `duration` seconds; `rate` is the scheduler's requests per second per host."""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    loop.set_default_executor(executor)
+    history = AlarmHistory(":memory:")
+    history.open()
+    pool = ParsePool()
+    report = LoadReport()
+    pollers: Dict[str, List[_Entry]] = {}
+    for query in entry_queries(entries, shared):
+        key = f"{url}?{urlencode({**query, 'antal': count})}"
+        pollers.setdefault(key, []).append(_Entry(count))
+    stop = asyncio.Event()
+    async with aiohttp.ClientSession() as session:
+        context = _Shared(session, pool, rate, max_bytes)
+        tasks = [asyncio.create_task(_poll(key, subs, history, report, context, floor, ceiling, stop))
+                 for key, subs in pollers.items()]
+        monitor = asyncio.create_task(_monitor(executor, report, stop))
+        await asyncio.sleep(duration)
+        stop.set()
+        # Pollers still queued for a scheduler token would otherwise be served one per token.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, monitor, return_exceptions=True)
+    history.close()
+    pool.shutdown()
+    report.parse_fallbacks = context.metrics.counters["fallback_parses"]
+    return {**report.as_dict(entries, len(pollers), duration), "parse_pool": pool.as_dict(),
+            "fetches": context.metrics.as_dict()["counters"],
+            "breakers": {endpoint: breaker.state for endpoint, breaker in context.breakers.items()}}
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    runner = None
+    url = args.url
+    if url is None:
+        standin = OdinStandin(args.items, faults_from_args(args))
+        runner = web.AppRunner(build_app(standin, args.alarm_every))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}{FEED_PATH}"
+    try:
+        return await run_load(url, args.entries, args.duration, args.count, args.floor, args.ceiling,
+                              not args.no_sharing, args.workers, args.max_kb * 1024, args.rate)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="poll this feed instead of starting a stand-in")
+    parser.add_argument("--entries", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--floor", type=float, default=1.0)
+    parser.add_argument("--ceiling", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=4, help="executor threads")
+    parser.add_argument("--no-sharing", action="store_true", help="one poller per entry")
+    parser.add_argument("--max-kb", type=int, default=MAX_BODY_BYTES // 1024, help="response size cap")
+    parser.add_argument("--rate", type=float, default=REQUEST_RATE, help="requests per second per host")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--alarm-every", type=float, default=2.0)
+    add_fault_arguments(parser)
+    print(json.dumps(asyncio.run(_main(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""aiohttp stand-in for ODIN's RSS.aspx with fault injection.
+
+Run it with ``python tests/standin/server.py --port 8099 --items 500 --error-rate 0.05``
+and point an entry (or the load harness) at ``http://127.0.0.1:8099/RSS/RSS.aspx``.
+Faults can also be changed while it runs by POSTing JSON to ``/faults``.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import pathlib
+import random
+import sys
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from synthetic import render_rss, synthetic_item, synthetic_items  # noqa: E402
+
+FEED_PATH = "/RSS/RSS.aspx"
+DEFAULT_ANTAL = 20
+
+
+@dataclass
+class Faults:
+    """Probabilities are per request; a request gets at most one body fault."""
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    truncate_rate: float = 0.0
+    malformed_rate: float = 0.0
+    # Send the body `drip_bytes` at a time with `drip_delay` seconds between writes.
+    drip_bytes: int = 0
+    drip_delay: float = 0.0
+    # Not a fault: gzip/deflate when the client asks, as the real feed does.
+    compress: bool = True
+
+    def update(self, values: Dict[str, float]) -> None:
+        names = {field.name: field.type for field in fields(self)}
+        for name, value in values.items():
+            if name not in names:
+                raise ValueError(f"Unknown fault {name!r}")
+            if name == "compress":
+                self.compress = bool(value)
+            else:
+                setattr(self, name, int(value) if name == "drip_bytes" else float(value))
+
+
+class OdinStandin:
+    """The feed state: generated items, newest first, plus the faults to inject."""
+
+    def __init__(self, items: int = 200, faults: Optional[Faults] = None, seed: int = 0) -> None:
+        self.items = synthetic_items(items)
+        self.faults = faults or Faults()
+        self.requests = 0
+        self._next_id = len(self.items)
+        self._rng = random.Random(seed)
+
+    def add_alarm(self) -> Dict[str, str]:
+        """Publish one new alarm at the top of the feed."""
+        item = synthetic_item(self._next_id, datetime.now(timezone.utc))
+        self._next_id += 1
+        self.items.insert(0, item)
+        return item
+
+    def select(self, beredskabsID: str | None, station: str | None, antal: int) -> List[Dict[str, str]]:
+        matches = (item for item in self.items
+                   if (not beredskabsID or item["beredskabsID"] == beredskabsID)
+                   and (not station or item["station"] == station))
+        selected = []
+        for item in matches:
+            if len(selected) >= antal:
+                break
+            selected.append(item)
+        return selected
+
+    async def handle_feed(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        faults = self.faults
+        delay = faults.latency + self._rng.uniform(0, faults.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._rng.random() < faults.error_rate:
+            return web.Response(status=self._rng.choice([500, 502, 503]), text="Server Error")
+        try:
+            antal = max(0, int(request.query.get("antal", DEFAULT_ANTAL)))
+        except ValueError:
+            antal = DEFAULT_ANTAL
+        body = render_rss(self.select(request.query.get("beredskabsID"), request.query.get("enhed"), antal))
+        roll = self._rng.random()
+        if roll < faults.truncate_rate:
+            body = body[: len(body) // 2]
+        elif roll < faults.truncate_rate + faults.malformed_rate:
+            body = body.replace(b"</item>", b"<item>", 1)
+        response = web.StreamResponse(headers={"Content-Type": "application/rss+xml; charset=utf-8"})
+        if faults.compress:
+            # Picks gzip or deflate from the request's Accept-Encoding, or nothing.
+            response.enable_compression()
+        await response.prepare(request)
+        step = faults.drip_bytes or len(body) or 1
+        for start in range(0, len(body), step):
+            await response.write(body[start:start + step])
+            if faults.drip_bytes and faults.drip_delay:
+                await asyncio.sleep(faults.drip_delay)
+        await response.write_eof()
+        return response
+
+    async def handle_faults(self, request: web.Request) -> web.Response:
+        if request.method == "POST":
+            try:
+                self.faults.update(await request.json())
+            except ValueError as err:
+                return web.Response(status=400, text=str(err))
+        return web.json_response(asdict(self.faults))
+
+    async def handle_alarm(self, request: web.Request) -> web.Response:
+        return web.json_response(self.add_alarm())
+
+
+def build_app(standin: OdinStandin, alarm_every: float = 0.0) -> web.Application:
+    """Serve `standin`; with `alarm_every` a new alarm is published that often."""
+    app = web.Application()
+    app.router.add_get(FEED_PATH, standin.handle_feed)
+    app.router.add_route("*", "/faults", standin.handle_faults)
+    app.router.add_post("/alarm", standin.handle_alarm)
+
+    if alarm_every:
+        async def _publish(_app):
+            while True:
+                await asyncio.sleep(alarm_every)
+                standin.add_alarm()
+
+        async def _start(app):
+            app["publisher"] = asyncio.create_task(_publish(app))
+
+        async def _stop(app):
+            app["publisher"].cancel()
+
+        app.on_startup.append(_start)
+        app.on_cleanup.append(_stop)
+    return app
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    for field in fields(Faults):
+        if field.name != "compress":
+            parser.add_argument(f"--{field.name.replace('_', '-')}", type=float, default=0.0)
+    parser.add_argument("--no-compress", dest="compress", action="store_false")
+
+
+def faults_from_args(args: argparse.Namespace) -> Faults:
+    faults = Faults()
+    faults.update({field.name: getattr(args, field.name) for field in fields(Faults)})
+    return faults
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--alarm-every", type=float, default=30.0, help="seconds between new alarms (0 = never)")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    standin = OdinStandin(args.items, faults_from_args(args))
+    web.run_app(build_app(standin, args.alarm_every), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
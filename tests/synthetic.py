@@ -0,0 +1,51 @@
+"""Generated ODIN-shaped feeds of any size for benchmarks and the stand-in server."""
+from __future__ import annotations
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+BEREDSKABS_IDS = [f"{n:08x}-1a2b-4c3d-9e8f-0a1b2c3d4e5f" for n in range(12)]
+STATIONS = [f"Station {n:02d}" for n in range(40)]
+KINDS = ["Brand i bygning", "Redning", "Automatisk brandalarm", "Brand i container", "Forurening"]
+START = datetime(2026, 10, 17, 23, 0, tzinfo=timezone.utc)
+
+
+def synthetic_item(n: int, published: datetime) -> Dict[str, str]:
+    """The `n`th generated alarm; IDs and stations repeat deterministically."""
+    beredskabsID = BEREDSKABS_IDS[n % len(BEREDSKABS_IDS)]
+    # Each beredskabsID owns a fixed slice of stations, as in the real feed.
+    station = STATIONS[(n % len(BEREDSKABS_IDS)) * 3 % len(STATIONS) + n // len(BEREDSKABS_IDS) % 3]
+    kind = KINDS[n % len(KINDS)]
+    return {
+        "title": f"{station} - {kind}",
+        "description": f"{kind} & udrykning, {station}. Beredskab: {beredskabsID}",
+        "published": format_datetime(published),
+        "link": f"http://www.odin.dk/112puls/alarm.aspx?id={100000 + n}&beredskabsID={beredskabsID}&enhed={quote(station)}",
+        "guid": f"odin-{100000 + n}",
+        "beredskabsID": beredskabsID,
+        "station": station,
+    }
+
+
+def synthetic_items(count: int, start: datetime = START) -> List[Dict[str, str]]:
+    """`count` items, newest first, seven minutes apart."""
+    return [synthetic_item(n, start - timedelta(minutes=7 * n)) for n in range(count)]
+
+
+def render_rss(items: List[Dict[str, str]]) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0">\n<channel>\n'
+        "<title>ODIN - 112 Alarmer</title>\n<link>http://www.odin.dk/112puls/</link>\n"
+        "<description>Seneste alarmer fra ODIN</description>\n"
+    ]
+    for item in items:
+        parts.append(
+            f"<item>\n<title>{escape(item['title'])}</title>\n"
+            f"<description>{escape(item['description'])}</description>\n"
+            f"<pubDate>{item['published']}</pubDate>\n<link>{escape(item['link'])}</link>\n"
+            f'<guid isPermaLink="false">{item["guid"]}</guid>\n</item>\n'
+        )
+    parts.append("</channel>\n</rss>\n")
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,23 @@
+def test_breaker_opens_probes_and_closes(load_odin_module):
+    breaker_module = load_odin_module("breaker")
+    breaker = breaker_module.CircuitBreaker(threshold=2, cooldown=10, max_cooldown=30)
+    breaker.record_failure(now=0)
+    assert breaker.state == breaker_module.CLOSED and breaker.retry_in(now=0) == 2
+    breaker.record_failure(now=0)
+    assert breaker.state == breaker_module.OPEN
+    assert not breaker.allow(now=5)
+    assert breaker.allow(now=10)
+    assert breaker.state == breaker_module.HALF_OPEN
+    assert not breaker.allow(now=11)
+    breaker.record_success()
+    assert breaker.state == breaker_module.CLOSED and breaker.allow(now=11)
+
+
+def test_breaker_failed_probe_doubles_cooldown(load_odin_module):
+    breaker_module = load_odin_module("breaker")
+    breaker = breaker_module.CircuitBreaker(threshold=1, cooldown=10, max_cooldown=15)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=10)
+    breaker.record_failure(now=10)
+    assert breaker.state == breaker_module.OPEN
+    assert breaker.retry_in(now=10) == 15
@@ -0,0 +1,27 @@
+import asyncio
+
+
+def test_feed_cache_shares_one_inflight_fetch(load_odin_module):
+    cache = load_odin_module("cache").FeedCache(ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"link": "a"}]
+
+    async def run():
+        first = await asyncio.gather(*(cache.async_get("u", fetch) for _ in range(5)))
+        again = await cache.async_get("u", fetch)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == [{"link": "a"}] for result in first)
+    assert again == [{"link": "a"}]
+
+
+def test_feed_cache_expires(load_odin_module):
+    cache = load_odin_module("cache").FeedCache(ttl=-1)
+    cache.put("u", [])
+    assert cache.get("u") is None
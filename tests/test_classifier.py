@@ -0,0 +1,26 @@
+def test_automaton_finds_overlapping_patterns(load_odin_module):
+    automaton = load_odin_module("classifier").KeywordAutomaton(["he", "she", "his", "hers"])
+    assert sorted(automaton.search("USHERS")) == [0, 1, 3]
+    assert list(automaton.search("nothing here")) == [0]
+    assert list(automaton.search("")) == []
+
+
+def test_classifier_includes_excludes_and_tags(load_odin_module, odin_payload):
+    classifier_module = load_odin_module("classifier")
+    parser = load_odin_module("parser")
+    items = [item.as_dict() for item in parser.parse_bytes(odin_payload, None)]
+    assert classifier_module.parse_categories(" Brand i bygning,Redning\nredning , ,Redning") == \
+        ["Brand i bygning", "Redning", "redning"]
+
+    classifier = classifier_module.CategoryClassifier(["brand i BYGNING", "Redning"], ["container"])
+    kept = classifier.apply(items)
+    assert kept and len(kept) < len(items)
+    assert {item["category"] for item in kept} <= {"brand i BYGNING", "Redning"}
+    assert all("container" not in item["title"].lower() for item in kept)
+    assert "category" not in items[0]
+
+    exclude_only = classifier_module.CategoryClassifier(exclude=["container"])
+    assert exclude_only.active
+    assert exclude_only.classify({"title": "Station Nord - Redning"}) == (True, None)
+    assert not exclude_only.accepts({"title": "x", "description": "Brand i Container"})
+    assert not classifier_module.CategoryClassifier().active
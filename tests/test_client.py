@@ -0,0 +1,84 @@
+import asyncio
+import io
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from standin.server import FEED_PATH, Faults, OdinStandin, build_app
+
+
+def _run(app, scenario):
+    async def run():
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await scenario(str(server.make_url(FEED_PATH)))
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_request_parses_and_reports_not_modified(load_odin_module, odin_payload):
+    client = load_odin_module("client")
+    metrics = load_odin_module("metrics")
+
+    async def handle(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=odin_payload, content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get(FEED_PATH, handle)
+
+    async def scenario(url):
+        async with aiohttp.ClientSession(trace_configs=[client.trace_config()]) as session:
+            timing = metrics.FetchTiming(0.0)
+            first = await client.async_request(session, url, 5, timing)
+            second = await client.async_request(session, url, 5, headers={"If-None-Match": first.etag})
+        return first, second, timing
+
+    first, second, timing = _run(app, scenario)
+    assert len(first.items) == 5 and first.etag == '"v1"' and first.consumed
+    assert timing.ttfb is not None and timing.total is not None and timing.items == 5
+    assert second.items is None and second.consumed == b""
+
+
+def test_request_raises_on_server_errors(load_odin_module):
+    client = load_odin_module("client")
+
+    async def scenario(url):
+        async with aiohttp.ClientSession() as session:
+            await client.async_request(session, url, 5)
+
+    with pytest.raises(aiohttp.ClientResponseError) as err:
+        _run(build_app(OdinStandin(items=10, faults=Faults(error_rate=1.0))), scenario)
+    assert err.value.status >= 500
+
+
+def test_cli_poll_and_profile(load_odin_module, odin_payload, tmp_path, capsys):
+    cli = load_odin_module("cli")
+    standin = OdinStandin(items=30)
+
+    async def scenario(url):
+        out = io.StringIO()
+        metrics = await cli.async_poll(url + "?antal=10", 10, 0.0, 2, out=out)
+        return out.getvalue(), metrics
+
+    output, metrics = _run(build_app(standin), scenario)
+    first, second = [json.loads(line) for line in output.splitlines()]
+    assert (first["status"], first["items"], first["new"]) == (200, 10, 10)
+    assert second["new"] == 0
+    assert metrics.counters["fetches"] == 2
+
+    feed = tmp_path / "feed.xml"
+    feed.write_bytes(odin_payload)
+    assert cli.main(["profile", str(feed), "--repeat", "3", "--count", "10"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["runs"], report["items"], report["bytes"]) == (3, 10, len(odin_payload))
+
+    feed.write_bytes(odin_payload[:-200] + b"<item><title>broken</item>")
+    assert cli.main(["profile", str(feed), "--repeat", "1"]) == 1
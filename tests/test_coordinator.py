@@ -0,0 +1,291 @@
+"""Shared coordinator behaviour inside a real Home Assistant test instance.
+
+Needs pytest-homeassistant-custom-component; skipped where it is not installed.
+The network is replaced at the client boundary (`async_request`), so breakers,
+scheduling, hashing, indexing and the sensor all run as in production.
+"""
+import asyncio
+import importlib
+import logging
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED  # noqa: E402
+from homeassistant.core import callback  # noqa: E402
+from homeassistant.helpers import frame  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant  # noqa: E402
+
+PACKAGE = "custom_components.112odin_alarner"
+client = importlib.import_module(f"{PACKAGE}.client")
+FeedResponse = client.FeedResponse
+parse_bytes = importlib.import_module(f"{PACKAGE}.parser").parse_bytes
+DOMAIN = "112odin_alarner"
+URL = "http://odin.test/RSS/RSS.aspx"
+
+
+@pytest.fixture
+def coordinator_module():
+    return importlib.import_module(f"{PACKAGE}.coordinator")
+
+
+class FakeFeed:
+    """Stands in for `client.async_request`: serves `body` and records every call."""
+
+    def __init__(self, body: bytes, etag: str | None = None) -> None:
+        self.body = body
+        self.etag = etag
+        self.calls = []
+
+    async def __call__(self, session, url, count, timing=None, max_bytes=None, headers=None, pool=None):
+        self.calls.append((url, dict(headers or {})))
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            return FeedResponse(None, b"", self.etag, None)
+        items = [item.as_dict() for item in parse_bytes(self.body, count)]
+        return FeedResponse(items, self.body, self.etag, None)
+
+
+def _entry(hass, **data) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data={"rss_url": URL, "beredskabsID": "1", "station": "", **data})
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def _setup(hass, entry) -> None:
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def _feed_sensor_writes(hass):
+    """Entity id of the entry's feed sensor and a list collecting every state write to it."""
+    (entity_id,) = [state.entity_id for state in hass.states.async_all("sensor") if "rss_url" in state.attributes]
+    writes = []
+
+    @callback
+    def _ours(event_data) -> bool:
+        return event_data["entity_id"] == entity_id
+
+    for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+        hass.bus.async_listen(event_type, callback(lambda event: writes.append(event.event_type)), _ours)
+    return entity_id, writes
+
+
+def _run(scenario, tmp_path) -> None:
+    async def run():
+        async with async_test_home_assistant(config_dir=str(tmp_path)) as hass:
+            # Let the loader find custom_components/ at the repository root.
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            # The options flow's config_entry handling reports through it, as in a running HA.
+            frame.async_setup(hass)
+            try:
+                await scenario(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_entries_share_a_coordinator_that_outlives_its_creator(coordinator_module, odin_payload, tmp_path):
+    _run(lambda hass: _entries_share_a_coordinator(hass, coordinator_module, odin_payload), tmp_path)
+
+
+async def _entries_share_a_coordinator(hass, coordinator_module, odin_payload):
+    feed = FakeFeed(odin_payload)
+    with patch.object(client, "async_request", feed):
+        # Setting up the domain sets up every entry already added, so add them one at a time.
+        first = _entry(hass)
+        await _setup(hass, first)
+        second = _entry(hass, count=3)
+        await _setup(hass, second)
+        coordinator = hass.data[DOMAIN][first.entry_id]
+        assert hass.data[DOMAIN][second.entry_id] is coordinator
+        assert coordinator.config_entry is None
+
+        assert await hass.config_entries.async_unload(first.entry_id)
+        await hass.async_block_till_done()
+        assert hass.data[DOMAIN]["coordinators"][coordinator.key] is coordinator
+        assert not coordinator._shutdown_requested
+        calls = len(feed.calls)
+        await coordinator.async_refresh()
+        assert len(feed.calls) == calls + 1 and coordinator.last_update_success
+        assert coordinator._unsub_refresh is not None
+
+        assert await hass.config_entries.async_unload(second.entry_id)
+        await hass.async_block_till_done()
+        assert coordinator.key not in hass.data[DOMAIN]["coordinators"]
+
+
+def test_size_cap_does_not_open_the_shared_breaker(coordinator_module, tmp_path):
+    parser = importlib.import_module(f"{PACKAGE}.parser")
+
+    async def too_large(*_args, **_kwargs):
+        raise parser.BodyTooLargeError("Response exceeded 1024 bytes")
+
+    async def scenario(hass):
+        with patch.object(client, "async_request", too_large):
+            for _ in range(5):
+                with pytest.raises(parser.BodyTooLargeError):
+                    await coordinator_module.async_fetch_items(hass, URL, 5, max_bytes=1024)
+        breaker = coordinator_module.get_breaker(hass, URL)
+        assert breaker.failures == 0 and breaker.allow()
+
+    _run(scenario, tmp_path)
+
+
+def test_only_full_feed_fetches_fill_the_flows_cache(coordinator_module, odin_payload, tmp_path):
+    async def scenario(hass):
+        cache = coordinator_module.get_feed_cache(hass)
+        with patch.object(client, "async_request", FakeFeed(odin_payload)):
+            await _setup(hass, _entry(hass, beredskabsID="", count=5))
+            assert cache.get(URL) is None
+            local = MockConfigEntry(domain=DOMAIN, version=2, options={"fetch_mode": "local"},
+                                    data={"rss_url": URL, "beredskabsID": "1", "station": ""})
+            local.add_to_hass(hass)
+            await _setup(hass, local)
+        assert len(cache.get(URL)) == 25
+
+    _run(scenario, tmp_path)
+
+
+def test_beredskabs_id_from_options_wins(coordinator_module, odin_payload, tmp_path):
+    async def scenario(hass):
+        feed = FakeFeed(odin_payload)
+        entry = MockConfigEntry(domain=DOMAIN, version=2, options={"beredskabsID": "2"},
+                                data={"rss_url": URL, "beredskabsID": "1", "station": ""})
+        entry.add_to_hass(hass)
+        with patch.object(client, "async_request", feed):
+            await _setup(hass, entry)
+        assert hass.data[DOMAIN][entry.entry_id].key == f"{URL}?beredskabsID=2"
+        assert "beredskabsID=2" in feed.calls[0][0]
+
+    _run(scenario, tmp_path)
+
+
+def test_unchanged_feed_skips_reindexing_and_state_writes(coordinator_module, odin_payload, tmp_path):
+    async def scenario(hass):
+        feed = FakeFeed(odin_payload, etag='"v1"')
+        entry = _entry(hass)
+        with patch.object(client, "async_request", feed):
+            await _setup(hass, entry)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            data, index = coordinator.data, coordinator.index
+            _entity_id, writes = _feed_sensor_writes(hass)
+
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert feed.calls[-1][1]["If-None-Match"] == '"v1"'
+            assert coordinator.metrics.counters["not_modified"] == 1
+
+            # A server without validators sending the same body again.
+            feed.etag = None
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert coordinator.metrics.counters["unchanged"] == 1
+
+        assert coordinator.data is data and coordinator.index is index
+        assert writes == []
+
+    _run(scenario, tmp_path)
+
+
+def test_identical_items_keep_attributes_stable(coordinator_module, odin_payload, tmp_path):
+    async def scenario(hass):
+        feed = FakeFeed(odin_payload)
+        entry = _entry(hass)
+        with patch.object(client, "async_request", feed):
+            await _setup(hass, entry)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            entity_id, writes = _feed_sensor_writes(hass)
+            before = hass.states.get(entity_id)
+
+            # Different bytes, same items: the coordinator publishes, the sensor has nothing new to say.
+            feed.body = odin_payload + b"\n"
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        after = hass.states.get(entity_id)
+        assert coordinator.metrics.counters["unchanged"] == 0
+        assert EVENT_STATE_CHANGED not in writes
+        assert after.attributes == before.attributes and after.last_changed == before.last_changed
+
+    _run(scenario, tmp_path)
+
+
+@pytest.mark.parametrize("error", [
+    importlib.import_module(f"{PACKAGE}.parser").BodyTooLargeError("Response exceeded 1024 bytes"),
+    importlib.import_module(f"{PACKAGE}.parsepool").ParseQueueFullError("8 parses already waiting"),
+], ids=["too_large", "parse_queue_full"])
+def test_local_errors_back_off_on_the_feeds_own_schedule(coordinator_module, odin_payload, tmp_path, error):
+    feed = FakeFeed(odin_payload)
+
+    async def too_large(*args, **kwargs):
+        raise error
+
+    async def scenario(hass):
+        entry = _entry(hass)
+        with patch.object(client, "async_request", feed):
+            await _setup(hass, entry)
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        delays = []
+        with patch.object(client, "async_request", too_large):
+            for _ in range(4):
+                await coordinator.async_refresh()
+                delays.append(coordinator.update_interval.total_seconds())
+        # Never the breaker's one-second retry, and growing towards the ceiling.
+        assert min(delays) >= 10 * 0.9
+        assert delays[-1] > delays[0]
+        assert coordinator.data is not None
+
+    _run(scenario, tmp_path)
+
+
+def test_aggregate_backs_off_when_every_feed_hits_a_local_limit(coordinator_module, tmp_path):
+    parsepool = importlib.import_module(f"{PACKAGE}.parsepool")
+
+    async def queue_full(*args, **kwargs):
+        raise parsepool.ParseQueueFullError("8 parses already waiting")
+
+    async def scenario(hass):
+        coordinator = coordinator_module.OdinAggregateCoordinator(hass, (URL, "http://other.test/RSS/RSS.aspx"))
+        coordinator.data = []
+        with patch.object(client, "async_request", queue_full):
+            assert await coordinator._async_fetch_and_parse(5) == []
+        assert coordinator.update_interval.total_seconds() >= 10 * 0.9
+
+    _run(scenario, tmp_path)
+
+
+def test_webhook_url_is_notified_once_and_never_logged(coordinator_module, odin_payload, tmp_path, caplog):
+    options_flow = importlib.import_module(f"{PACKAGE}.options_flow")
+
+    async def scenario(hass):
+        entry = MockConfigEntry(domain=DOMAIN, version=2, data={"rss_url": URL, "beredskabsID": "1", "station": ""})
+        entry.add_to_hass(hass)
+        with patch.object(options_flow.persistent_notification, "async_create") as notify:
+            flow = options_flow.OdinOptionsFlowHandler(entry)
+            flow.hass = hass
+            options = flow._ingest_options({"ingest_mode": "push"})
+        webhook_id = options["webhook_id"]
+        assert webhook_id in notify.call_args.args[1]
+
+        hass.config_entries.async_update_entry(entry, options=options)
+        caplog.set_level(logging.DEBUG)
+        with patch.object(client, "async_request", FakeFeed(odin_payload)):
+            await _setup(hass, entry)
+        assert webhook_id not in caplog.text
+
+    _run(scenario, tmp_path)
+
+
+def test_options_flow_lists_stations_from_the_shared_feed(odin_payload, tmp_path):
+    async def scenario(hass):
+        entry = _entry(hass)
+        with patch.object(client, "async_request", FakeFeed(odin_payload)):
+            await _setup(hass, entry)
+            result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == "form" and not result.get("errors")
+
+    _run(scenario, tmp_path)
@@ -0,0 +1,20 @@
+def test_station_map_is_ordered_and_deduplicated(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+    extract = load_odin_module("extract")
+    items = [item.as_dict() for item in parser.parse_bytes(odin_payload, None)]
+    mapping = extract.build_station_map(items)
+
+    assert extract.beredskabs_ids(mapping) == [
+        "4f2c1b9e-1a2b-4c3d-9e8f-0a1b2c3d4e5f",
+        "9a8b7c6d-5e4f-4321-abcd-ef0123456789",
+    ]
+    assert extract.stations_for(mapping, "9a8b7c6d-5e4f-4321-abcd-ef0123456789") == [
+        "Station Syd", "Station Nord", "Tåstrup",
+    ]
+    assert len(extract.stations_for(mapping, None)) == 4
+
+
+def test_item_ids_falls_back_to_summary_and_title(load_odin_module):
+    extract = load_odin_module("extract")
+    item = {"link": "http://x/", "summary": "see ?beredskabsID=abc&foo=1", "title": "Lystrup - Redning"}
+    assert extract.item_ids(item) == ("abc", "Lystrup")
@@ -0,0 +1,48 @@
+import time
+
+
+def _record(history, key, station, published):
+    return history.AlarmRecord(key, "b1", station, published, f"alarm {key}", f"http://odin/{key}")
+
+
+def test_history_dedupes_and_queries_by_station(load_odin_module, tmp_path):
+    history = load_odin_module("history")
+    store = history.AlarmHistory(str(tmp_path / "h.db"))
+    store.open()
+    now = time.time()
+    records = [_record(history, str(i), "A" if i % 2 else "B", now - i * 3600) for i in range(10)]
+    assert store.add(records) == 10
+    assert store.add(records[:3]) == 0
+
+    recent_a = store.query(station="A", since=now - 4.5 * 3600)
+    assert [r.key for r in recent_a] == ["1", "3"]
+    store.close()
+
+
+def test_history_answers_old_queries_from_disk_and_respects_caps(load_odin_module, tmp_path):
+    history = load_odin_module("history")
+    path = str(tmp_path / "h.db")
+    now = time.time()
+    store = history.AlarmHistory(path, retention_days=1, max_rows=5, hot_size=2)
+    store.open()
+    store.add([_record(history, str(i), "A", now - i * 60) for i in range(8)])
+    store.add([_record(history, "old", "A", now - 2 * 86400)])
+    store.close()
+
+    reopened = history.AlarmHistory(path, retention_days=1, max_rows=5, hot_size=2)
+    reopened.open()
+    keys = [r.key for r in reopened.query(station="A")]
+    assert keys == ["0", "1", "2", "3", "4"]
+    assert reopened.add([_record(history, "4", "A", now - 4 * 60)]) == 0
+    reopened.close()
+
+
+def test_records_from_items_parses_rfc822(load_odin_module):
+    history = load_odin_module("history")
+    items = [{"guid": "g", "link": "l", "title": "t", "published": "Sat, 17 Oct 2026 23:00:00 +0200"}]
+    (record,) = history.records_from_items(items, lambda item: ("b", "s"))
+    assert record.published == 1792270800.0
+    assert (record.beredskabsID, record.station) == ("b", "s")
+    # A stamped timestamp is used as is.
+    items[0]["published_ts"] = 1.0
+    assert history.records_from_items(items, lambda item: ("b", "s"))[0].published == 1.0
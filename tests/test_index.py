@@ -0,0 +1,54 @@
+def test_feed_index_lookup_by_id_station_and_pair(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+    index_module = load_odin_module("index")
+    extract = load_odin_module("extract")
+    items = [item.as_dict() for item in parser.parse_bytes(odin_payload, 200)]
+    index = index_module.FeedIndex(items)
+
+    beredskabsID, station = extract.item_ids(items[1])
+    assert station == "Station Syd"
+    by_pair = index.lookup(beredskabsID, station, 200)
+    assert by_pair and all(extract.item_ids(item) == (beredskabsID, station) for item in by_pair)
+    assert len(index.lookup(beredskabsID, None, 200)) > len(by_pair)
+    assert index.lookup(None, station, 2) == by_pair[:2]
+    assert index.lookup(None, None, 3) == items[:3]
+    assert index.lookup("unknown", None, 5) == []
+
+
+def test_normalize_items_stamps_and_sorts(load_odin_module):
+    index_module = load_odin_module("index")
+    items = [
+        {"title": "b", "published": "Mon, 01 Jan 2024 09:00:00 +0100"},
+        {"title": "a", "published": "Mon, 01 Jan 2024 10:00:00 +0000"},
+        {"title": "undated"},
+        {"title": "c", "published": "Mon, 01 Jan 2024 07:00:00 GMT"},
+    ]
+    index_module.normalize_items(items, now=0.0)
+    assert [item["title"] for item in items] == ["a", "b", "c", "undated"]
+    assert items[0]["published_ts"] == 1704103200.0
+    assert items[-1]["published_ts"] == 0.0
+    # Already stamped items keep their timestamp.
+    index_module.normalize_items(items, now=1.0)
+    assert items[-1]["published_ts"] == 0.0
+
+
+def test_feed_index_since_bisects_each_bucket(load_odin_module):
+    index_module = load_odin_module("index")
+    items = index_module.normalize_items([
+        {"title": "b", "published": "Mon, 01 Jan 2024 09:00:00 +0100", "link": "http://x/?beredskabsID=1"},
+        {"title": "a", "published": "Mon, 01 Jan 2024 10:00:00 +0000", "link": "http://x/?beredskabsID=2"},
+        {"title": "c", "published": "Mon, 01 Jan 2024 07:00:00 GMT", "link": "http://x/?beredskabsID=1"},
+    ], now=0.0)
+    index = index_module.FeedIndex(items)
+    assert [item["title"] for item in index.since(1704092400.0)] == ["a", "b", "c"]
+    assert [item["title"] for item in index.since(1704096000.0)] == ["a", "b"]
+    assert index.since(1704103201.0) == []
+    assert [item["title"] for item in index.since(1704092400.0, "1")] == ["b", "c"]
+
+
+def test_undated_items_keep_their_first_seen_stamp(load_odin_module):
+    index_module = load_odin_module("index")
+    first = index_module.normalize_items([{"guid": "u", "title": "undated"}], now=100.0)
+    again = index_module.normalize_items([{"guid": "u", "title": "undated"}, {"guid": "v"}], now=200.0,
+                                         previous=first)
+    assert {item["guid"]: item["published_ts"] for item in again} == {"u": 100.0, "v": 200.0}
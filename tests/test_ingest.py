@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+
+def test_parse_push_body_accepts_rss_item_document_and_json(load_odin_module, odin_payload):
+    ingest = load_odin_module("ingest")
+    single = ingest.parse_push_body(
+        b"<item><title>Station Nord - Brand</title><link>https://odin.dk/a</link>"
+        b"<pubDate>Mon, 01 Jan 2024 10:00:00 +0000</pubDate></item>",
+        "application/rss+xml",
+    )
+    assert single == [{
+        "title": "Station Nord - Brand", "description": None, "summary": None,
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000", "link": "https://odin.dk/a", "guid": None,
+    }]
+    assert len(ingest.parse_push_body(odin_payload)) == 25
+
+    batch = json.dumps({"items": [{"title": "a", "id": "1", "summary": "s"}, {"title": "b", "link": "l"}]})
+    items = ingest.parse_push_body(batch.encode(), "application/json")
+    assert [item["guid"] for item in items] == ["1", None]
+    assert items[0]["description"] == "s"
+    assert ingest.parse_push_body(b'{"guid": "x"}')[0]["guid"] == "x"
+
+
+@pytest.mark.parametrize("body", [b"{oops", b"<item>", b'[{"title": "no key"}]', b"[1]"])
+def test_parse_push_body_rejects_bad_bodies(load_odin_module, body):
+    with pytest.raises(ValueError):
+        load_odin_module("ingest").parse_push_body(body)
+
+
+def test_parse_push_body_coerces_numeric_json_fields(load_odin_module):
+    ingest = load_odin_module("ingest")
+    index = load_odin_module("index")
+    merge = load_odin_module("merge")
+    items = ingest.parse_push_body(b'[{"guid": 123, "title": 7, "published": 1700000000}]', "application/json")
+    assert items[0]["guid"] == "123" and items[0]["title"] == "7"
+    assert items[0]["published"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+    index.normalize_items(items, now=0.0)
+    assert items[0]["published_ts"] == 1700000000.0
+    assert merge.dedupe_keys(items[0]) == ["guid:123"]
+    merged = merge.merge_feeds([items, ingest.parse_push_body(b'{"guid": "9", "published": 1600000000.5}')], 5)
+    assert [item["guid"] for item in merged] == ["123", "9"]
+
+
+@pytest.mark.parametrize("body", [b'{"guid": {"a": 1}}', b'{"guid": "x", "title": ["t"]}',
+                                  b'{"guid": true}', b'{"guid": "x", "published": [1]}'])
+def test_parse_push_body_rejects_unusable_field_types(load_odin_module, body):
+    with pytest.raises(ValueError):
+        load_odin_module("ingest").parse_push_body(body)
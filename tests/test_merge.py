@@ -0,0 +1,22 @@
+def test_merge_feeds_dedupes_by_guid_or_normalized_link(load_odin_module):
+    merge = load_odin_module("merge")
+    a = [
+        {"guid": "1", "link": "https://Odin.dk/a?x=1&y=2", "published": "Mon, 01 Jan 2024 10:00:00 +0000"},
+        {"guid": "2", "link": "https://odin.dk/b", "published": "Mon, 01 Jan 2024 08:00:00 +0000"},
+    ]
+    b = [
+        {"link": "https://odin.dk/a/?y=2&x=1#top", "published": "Mon, 01 Jan 2024 10:00:00 +0000"},
+        {"guid": "2", "link": "https://mirror.example/b", "published": "Mon, 01 Jan 2024 08:00:00 +0000"},
+        {"guid": "3", "link": "https://odin.dk/c", "published": "Mon, 01 Jan 2024 09:00:00 +0000"},
+    ]
+    merged = merge.merge_feeds([a, b], count=10, now=0)
+    assert [item.get("guid") for item in merged] == ["1", "3", "2"]
+    assert merged[2]["link"] == "https://odin.dk/b"
+    assert len(merge.merge_feeds([a, b], count=2, now=0)) == 2
+
+
+def test_merge_keeps_first_seen_stamps_of_undated_items(load_odin_module):
+    merge = load_odin_module("merge")
+    first = merge.merge_feeds([[{"guid": "u", "title": "undated"}]], count=5, now=100.0)
+    again = merge.merge_feeds([[{"guid": "u", "title": "undated"}]], count=5, now=200.0, previous=first)
+    assert again[0]["published_ts"] == 100.0
@@ -0,0 +1,35 @@
+def test_rolling_histogram_keeps_a_fixed_window(load_odin_module):
+    histogram = load_odin_module("metrics").RollingHistogram(size=10)
+    assert histogram.summary() == {"count": 0}
+    for value in range(100):
+        histogram.add(float(value))
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert (summary["last"], summary["p50"], summary["p95"], summary["max"]) == (99.0, 95.0, 99.0, 99.0)
+    assert histogram.percentile(0) == 90.0
+
+
+def test_feed_metrics_counts_retries_and_records_timings(load_odin_module):
+    metrics_module = load_odin_module("metrics")
+    metrics = metrics_module.FeedMetrics()
+
+    failed = metrics_module.FetchTiming(0.0)
+    failed.total = 10.0
+    metrics.fetch_started()
+    metrics.fetch_finished(failed, ok=False)
+
+    ok = metrics_module.FetchTiming(0.0)
+    ok.ttfb, ok.body, ok.parse, ok.executor_wait, ok.total = 0.1, 0.2, 0.05, 0.01, 0.4
+    ok.bytes, ok.items = 2048, 5
+    metrics.fetch_started()
+    metrics.fetch_finished(ok, ok=True)
+    metrics.fetch_started()
+
+    data = metrics.as_dict()
+    assert data["counters"]["fetches"] == 3
+    assert data["counters"]["failures"] == 1
+    assert data["counters"]["retries"] == 1
+    assert data["counters"]["fallback_parses"] == 1
+    assert data["seconds"]["total"]["max"] == 10.0
+    assert data["seconds"]["dns"] == {"count": 0}
+    assert data["bytes"]["last"] == 2048 and data["items"]["last"] == 5
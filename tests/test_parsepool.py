@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+
+def _blocked(gate, value):
+    gate.wait(5)
+    return value
+
+
+def test_pool_coalesces_waiting_jobs_and_reports_waits(load_odin_module):
+    parsepool = load_odin_module("parsepool")
+    pool = parsepool.ParsePool(workers=1, max_queue=4)
+    gate = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run("a", _blocked, gate, "first"))
+        await asyncio.sleep(0)
+        older = asyncio.ensure_future(pool.run("b", _blocked, gate, "old"))
+        newer = asyncio.ensure_future(pool.run("b", _blocked, gate, "new"))
+        await asyncio.sleep(0.01)
+        depth = pool.depth
+        gate.set()
+        return depth, await busy, await older, await newer
+
+    try:
+        depth, busy, older, newer = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert depth == 1
+    assert busy[0] == "first" and older[0] == "new" and newer[0] == "new"
+    assert older[1] > 0 and older[2] >= 0
+    stats = pool.as_dict()
+    assert stats["counters"] == {"submitted": 3, "coalesced": 1, "rejected": 0, "completed": 2, "failed": 0}
+    assert stats["max_depth"] == 1 and stats["wait_seconds"]["count"] == 2
+
+
+def test_pool_rejects_when_full_and_propagates_errors(load_odin_module):
+    parsepool = load_odin_module("parsepool")
+    pool = parsepool.ParsePool(workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run("a", _blocked, gate, 1))
+        queued = asyncio.ensure_future(pool.run("b", _blocked, gate, 2))
+        await asyncio.sleep(0)
+        with pytest.raises(parsepool.ParseQueueFullError):
+            await pool.run("c", _blocked, gate, 3)
+        gate.set()
+        await asyncio.gather(busy, queued)
+        with pytest.raises(ZeroDivisionError):
+            await pool.run("d", divmod, 1, 0)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert pool.counters["rejected"] == 1 and pool.counters["failed"] == 1
+
+
+def test_process_pool_runs_the_feedparser_fallback(load_odin_module, odin_payload):
+    parsepool = load_odin_module("parsepool")
+    client = load_odin_module("client")
+    pool = parsepool.ParsePool(workers=1, processes=True)
+    broken = odin_payload.replace(b"</channel>", b"")
+
+    async def scenario():
+        return await client.async_parse_fallback(broken, 3, pool=pool, key="feed")
+
+    try:
+        items = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert len(items) == 3 and items[0]["title"]
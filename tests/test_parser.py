@@ -0,0 +1,54 @@
+import asyncio
+import feedparser
+import pytest
+
+
+def test_stream_parser_matches_feedparser(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+    items = [item.as_dict() for item in parser.parse_bytes(odin_payload, 20)]
+    expected = [
+        {
+            "title": it.get("title"),
+            "description": it.get("description"),
+            "summary": it.get("summary"),
+            "published": it.get("published"),
+            "link": it.get("link"),
+            "guid": it.get("id"),
+        }
+        for it in feedparser.parse(odin_payload).entries[:20]
+    ]
+    assert items == expected
+
+
+def test_stream_parser_stops_reading_after_count(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+
+    async def chunks():
+        for start in range(0, len(odin_payload), 256):
+            yield odin_payload[start:start + 256]
+
+    items, consumed = asyncio.run(parser.async_parse_stream(chunks(), 3))
+    assert len(items) == 3
+    assert len(consumed) < len(odin_payload) // 2
+
+
+def test_stream_parser_aborts_past_size_cap(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+    read = []
+
+    async def chunks():
+        for start in range(0, len(odin_payload), 256):
+            read.append(start)
+            yield odin_payload[start:start + 256]
+
+    with pytest.raises(parser.BodyTooLargeError):
+        asyncio.run(parser.async_parse_stream(chunks(), None, max_bytes=1000))
+    assert len(read) == 4
+
+
+def test_stream_parser_raises_on_malformed(load_odin_module, odin_payload):
+    parser = load_odin_module("parser")
+    broken = odin_payload.replace(b"</title>", b"</titel>", 1)
+    with pytest.raises(parser.ParseError):
+        parser.parse_bytes(broken, 20)
+
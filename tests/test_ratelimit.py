@@ -0,0 +1,59 @@
+import asyncio
+
+
+def test_token_bucket_refills_at_rate(load_odin_module):
+    bucket = load_odin_module("ratelimit").TokenBucket(rate=2.0, burst=2, now=0.0)
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == 0.5
+    assert bucket.take(0.5) == 0.0
+
+
+def test_scheduler_paces_bursts_and_serves_recent_activity_first(load_odin_module):
+    ratelimit = load_odin_module("ratelimit")
+
+    async def run():
+        scheduler = ratelimit.RequestScheduler(rate=50.0, burst=2)
+        loop = asyncio.get_running_loop()
+        order = []
+
+        async def request(name, priority):
+            await scheduler.acquire("odin.dk", priority)
+            order.append((name, loop.time()))
+
+        started = loop.time()
+        # The first two use the burst; the rest queue and leave by priority.
+        await asyncio.gather(*(request(f"quiet{n}", 120.0) for n in range(4)), request("active", 10.0))
+        other_host = loop.time()
+        await scheduler.acquire("mirror.example")
+        return started, order, loop.time() - other_host
+
+    started, order, other_wait = asyncio.run(run())
+    names = [name for name, _at in order]
+    assert names[:2] == ["quiet0", "quiet1"]
+    assert names[2] == "active"
+    assert order[-1][1] - started >= 2 / 50.0 * 0.9
+    assert other_wait < 0.01
+
+
+def test_scheduler_skips_cancelled_waiters(load_odin_module):
+    ratelimit = load_odin_module("ratelimit")
+
+    async def run():
+        scheduler = ratelimit.RequestScheduler(rate=100.0, burst=1)
+        await scheduler.acquire("h")
+        waiter = asyncio.ensure_future(scheduler.acquire("h"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait_for(scheduler.acquire("h"), 1)
+        return scheduler.waiting("h")
+
+    assert asyncio.run(run()) == 0
+
+
+def test_start_offsets_spread_over_window(load_odin_module):
+    ratelimit = load_odin_module("ratelimit")
+    scheduler = ratelimit.RequestScheduler()
+    offsets = [scheduler.start_offset() for _ in range(40)]
+    assert offsets[:3] == [0.0, ratelimit.STAGGER_SPACING, 2 * ratelimit.STAGGER_SPACING]
+    assert max(offsets) < ratelimit.STAGGER_WINDOW
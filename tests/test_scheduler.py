@@ -0,0 +1,14 @@
+def test_adaptive_interval_snaps_to_floor_and_backs_off(load_odin_module):
+    scheduler = load_odin_module("scheduler")
+    interval = scheduler.AdaptiveInterval(10, 120, 30, "feed", jitter=0)
+    assert interval.next(True) == 10
+    assert [interval.next(False) for _ in range(5)] == [20, 40, 80, 120, 120]
+
+
+def test_adaptive_interval_jitter_differs_per_key(load_odin_module):
+    scheduler = load_odin_module("scheduler")
+    a = scheduler.AdaptiveInterval(10, 120, 30, "feed-a")
+    b = scheduler.AdaptiveInterval(10, 120, 30, "feed-b")
+    delays = [a.next(False), b.next(False)]
+    assert delays[0] != delays[1]
+    assert all(54 <= delay <= 66 for delay in delays)
@@ -0,0 +1,13 @@
+def test_seen_items_reports_only_new(load_odin_module):
+    seen = load_odin_module("seen").SeenItems()
+    first = [{"guid": "a"}, {"guid": "b"}]
+    assert seen.update(first) == first
+    assert seen.update([{"guid": "c"}, {"guid": "a"}]) == [{"guid": "c"}]
+
+
+def test_seen_items_falls_back_to_link_and_is_bounded(load_odin_module):
+    seen = load_odin_module("seen").SeenItems(maxlen=2)
+    seen.update([{"link": "x"}, {"link": "y"}, {"link": "z"}])
+    assert len(seen) == 2
+    assert "x" not in seen
+    assert seen.update([{"link": "x"}]) == [{"link": "x"}]
@@ -0,0 +1,11 @@
+import pytest
+
+pytest.importorskip("homeassistant")
+
+
+def test_snapshot_round_trip_drops_duplicate_summary(load_odin_module):
+    snapshot = load_odin_module("snapshot")
+    items = [{"title": "t", "description": "d", "summary": "d", "published": "p", "link": "l", "guid": None}]
+    records = snapshot.compact(items)
+    assert records == [{"t": "t", "d": "d", "p": "p", "l": "l"}]
+    assert snapshot.expand(records) == items
@@ -0,0 +1,124 @@
+import asyncio
+from xml.etree.ElementTree import ParseError
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
+from standin.harness import run_load
+from standin.server import FEED_PATH, Faults, OdinStandin, build_app
+from synthetic import BEREDSKABS_IDS
+
+
+def _serve(standin, scenario):
+    async def run():
+        server = TestServer(build_app(standin))
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                return await scenario(session, str(server.make_url(FEED_PATH)))
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_standin_honors_query_params(load_odin_module):
+    parser = load_odin_module("parser")
+    standin = OdinStandin(items=100)
+    beredskabsID = BEREDSKABS_IDS[1]
+
+    async def scenario(session, url):
+        async with session.get(url, params={"beredskabsID": beredskabsID, "antal": 3}) as resp:
+            by_id = parser.parse_bytes(await resp.read(), None)
+        station = by_id[0].title.split(" - ")[0]
+        async with session.get(url, params={"beredskabsID": beredskabsID, "enhed": station, "antal": 50}) as resp:
+            by_station = parser.parse_bytes(await resp.read(), None)
+        return by_id, station, by_station
+
+    by_id, station, by_station = _serve(standin, scenario)
+    assert len(by_id) == 3 and all(beredskabsID in item.link for item in by_id)
+    assert by_station and all(item.title.startswith(station) for item in by_station)
+
+
+def test_standin_injects_faults(load_odin_module):
+    parser = load_odin_module("parser")
+    standin = OdinStandin(items=20, faults=Faults(error_rate=1.0))
+
+    async def scenario(session, url):
+        async with session.get(url) as resp:
+            status = resp.status
+        standin.faults.update({"error_rate": 0, "malformed_rate": 1})
+        async with session.get(url) as resp:
+            malformed = await resp.read()
+        standin.faults.update({"malformed_rate": 0, "truncate_rate": 1})
+        async with session.get(url) as resp:
+            truncated = await resp.read()
+        standin.faults.update({"truncate_rate": 0, "drip_bytes": 512, "drip_delay": 0.001})
+        async with session.get(url, params={"antal": 5}) as resp:
+            chunks = [chunk async for chunk in resp.content.iter_any()]
+        return status, malformed, truncated, chunks
+
+    status, malformed, truncated, chunks = _serve(standin, scenario)
+    assert status >= 500
+    for body in (malformed, truncated):
+        with pytest.raises(ParseError):
+            parser.parse_bytes(body, None)
+    assert len(parser.parse_bytes(b"".join(chunks), None)) == 5
+
+
+def test_standin_compresses_when_asked(load_odin_module):
+    parser = load_odin_module("parser")
+    standin = OdinStandin(items=200)
+
+    async def scenario(session, url):
+        async with session.get(url, params={"antal": 200}, headers={"Accept-Encoding": "gzip, deflate"}) as resp:
+            encoding = resp.headers.get("Content-Encoding")
+            items, consumed = await parser.async_parse_stream(resp.content.iter_chunked(parser.CHUNK_SIZE), None)
+        async with session.get(url, params={"antal": 200}, headers={"Accept-Encoding": "gzip"}) as resp:
+            with pytest.raises(parser.BodyTooLargeError):
+                await parser.async_parse_stream(resp.content.iter_chunked(parser.CHUNK_SIZE), None, max_bytes=8192)
+        return encoding, items
+
+    encoding, items = _serve(standin, scenario)
+    assert encoding in ("gzip", "deflate")
+    assert len(items) == 200
+
+
+def test_harness_reports_latency_lag_and_executor_depth():
+    standin = OdinStandin(items=50)
+
+    async def scenario(session, url):
+        # A generous scheduler rate so every poller gets through in half a second.
+        return await run_load(url, entries=120, duration=0.5, floor=0.1, ceiling=0.2, rate=1000.0)
+
+    report = _serve(standin, scenario)
+    assert report["entries"] == 120 and report["pollers"] < 120
+    assert report["updates"] >= report["pollers"]
+    assert report["update_latency_ms"]["p50"] is not None
+    assert report["loop_lag_ms"]["p99"] is not None
+    assert report["executor_queue_depth"]["max"] >= 0
+    assert report["parse_pool"]["depth"] == 0
+    assert report["fetches"]["fetches"] >= report["updates"]
+
+
+def test_harness_polls_through_the_integrations_request_scheduler():
+    standin = OdinStandin(items=50)
+
+    async def scenario(session, url):
+        return await run_load(url, entries=120, duration=0.5, floor=0.1, ceiling=0.2)
+
+    report = _serve(standin, scenario)
+    # The default scheduler allows a burst of 4 and then 1 request per second per host.
+    assert report["fetches"]["fetches"] <= 5 < report["pollers"]
+    assert report["breakers"] and all(state == "closed" for state in report["breakers"].values())
+
+
+def test_harness_counts_oversized_responses_instead_of_aborting():
+    standin = OdinStandin(items=50)
+
+    async def scenario(session, url):
+        return await run_load(url, entries=10, duration=0.3, floor=0.1, ceiling=0.2, max_bytes=512, rate=1000.0)
+
+    report = _serve(standin, scenario)
+    assert report["errors"] >= report["pollers"] and report["updates"] == 0
@@ -0,0 +1,40 @@
+import ast
+import json
+import pathlib
+import subprocess
+import sys
+
+PACKAGE_DIR = pathlib.Path(__file__).resolve().parent.parent / "custom_components" / "112odin_alarner"
+
+# Modules that import Home Assistant cannot be timed here, and `client` mostly
+# costs aiohttp, which HA has loaded long before; these are the rest of what the
+# integration loads at startup.
+HA_FREE_MODULES = ["attributes", "breaker", "cache", "classifier", "extract", "history", "index", "ingest", "merge",
+                   "metrics", "parser", "parsepool", "ratelimit", "scheduler", "seen", "stats", "timestamps"]
+
+
+def test_no_module_imports_feedparser_at_load_time():
+    for path in PACKAGE_DIR.glob("*.py"):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in tree.body:
+            names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else \
+                [node.module] if isinstance(node, ast.ImportFrom) else []
+            assert "feedparser" not in names, f"{path.name} imports feedparser at module level"
+
+
+def test_import_time_within_budget(load_odin_module):
+    budget = load_odin_module("const").IMPORT_BUDGET
+    script = f"""
+import importlib, json, sys, time, types
+package = types.ModuleType("odin_alarner")
+package.__path__ = [{str(PACKAGE_DIR)!r}]
+sys.modules["odin_alarner"] = package
+started = time.perf_counter()
+for name in {HA_FREE_MODULES!r}:
+    importlib.import_module("odin_alarner." + name)
+print(json.dumps({{"seconds": time.perf_counter() - started, "feedparser": "feedparser" in sys.modules}}))
+"""
+    result = json.loads(subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                                       text=True).stdout)
+    assert not result["feedparser"]
+    assert result["seconds"] < budget
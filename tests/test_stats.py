@@ -0,0 +1,27 @@
+def test_ring_counter_slides_and_expires(load_odin_module):
+    stats = load_odin_module("stats")
+    counter = stats.RingCounter(span=60, buckets=6)
+    for ts in (0, 5, 15, 30):
+        counter.add(ts, now=30)
+    assert counter.total(now=30) == 4
+    assert counter.total(now=65) == 2
+    assert counter.total(now=200) == 0
+    counter.add(-500, now=200)
+    assert counter.total(now=200) == 0
+
+
+def test_entry_stats_per_station_and_restore(load_odin_module):
+    stats = load_odin_module("stats")
+    entry = stats.EntryStats()
+    items = [{"s": "A", "t": 100.0}, {"s": "B", "t": 3000.0}, {"s": "A", "t": 3500.0}]
+    added = entry.record(items, 3600.0, lambda item: item["t"], lambda item: item["s"])
+    assert added == ["A", "B"]
+    assert entry.overall.total("1h", 3600.0) == 3
+    assert entry.stations["A"].total("1h", 3700.0) == 1
+    assert entry.stations["A"].total("24h", 3700.0) == 2
+
+    restored = stats.EntryStats()
+    restored.restore(entry.as_dict())
+    assert restored.restored
+    assert restored.overall.total("7d", 3600.0) == 3
+    assert restored.stations["B"].total("1h", 3600.0) == 1
@@ -0,0 +1,18 @@
+def test_published_epoch_caches_parses_and_falls_back(load_odin_module):
+    timestamps = load_odin_module("timestamps")
+    timestamps._parse_epoch.cache_clear()
+    for _ in range(3):
+        assert timestamps.published_epoch("Sat, 17 Oct 2026 23:00:00 +0200", 0.0) == 1792270800.0
+    assert timestamps._parse_epoch.cache_info().hits == 2
+    # Naive dates are taken as UTC.
+    assert timestamps.published_epoch("Sat, 17 Oct 2026 21:00:00 -0000", 0.0) == 1792270800.0
+    assert timestamps.published_epoch("not a date", 5.0) == 5.0
+    assert timestamps.published_epoch(None, 7.0) == 7.0
+
+
+def test_item_epoch_prefers_the_stamped_timestamp(load_odin_module):
+    timestamps = load_odin_module("timestamps")
+    item = {"published": "Sat, 17 Oct 2026 23:00:00 +0200"}
+    assert timestamps.item_epoch(item, 0.0) == 1792270800.0
+    item[timestamps.TS_KEY] = 1.0
+    assert timestamps.item_epoch(item, 0.0) == 1.0